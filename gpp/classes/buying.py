@@ -1163,60 +1163,30 @@ get_buying_progress = ensure_buying_compatibility(get_buying_progress)
 
 
 # ===== DATABASE OPERATIONS =====
+# Storage lives in gpp.interface.utils.buying_database (snapshot plus append-only log);
+# these wrappers only add the enhanced-field upgrade. Imported lazily to avoid a cycle.
 
 def save_buying_transaction(buying_obj: Buying):
     """Save buying transaction to database"""
-    # Ensure enhanced fields before saving
-    buying_obj = ensure_enhanced_fields(buying_obj)
+    from gpp.interface.utils import buying_database
 
-    # Import here to avoid circular imports
-    try:
-        from gpp.interface.utils.database import load_data, save_data
-        from gpp.interface.config.constants import BUYING_TRANSACTIONS_FILE
-
-        transactions = load_data(BUYING_TRANSACTIONS_FILE)
-        transactions[buying_obj.buying_id] = buying_obj.dict()
-        save_data(BUYING_TRANSACTIONS_FILE, transactions)
-    except ImportError:
-        pass  # Skip database save if imports fail
+    buying_database.save_buying_transaction(ensure_enhanced_fields(buying_obj))
 
 
 def load_buying_transaction(buying_id: str) -> Optional[Buying]:
     """Load buying transaction from database"""
-    try:
-        from gpp.interface.utils.database import load_data
-        from gpp.interface.config.constants import BUYING_TRANSACTIONS_FILE
+    from gpp.interface.utils import buying_database
 
-        transactions = load_data(BUYING_TRANSACTIONS_FILE)
-        if buying_id in transactions:
-            buying_obj = Buying(**transactions[buying_id])
-            return ensure_enhanced_fields(buying_obj)
-    except ImportError:
-        pass  # Skip database load if imports fail
-
-    return None
+    buying_obj = buying_database.load_buying_transaction(buying_id)
+    return ensure_enhanced_fields(buying_obj) if buying_obj is not None else None
 
 
 def get_all_buying_transactions() -> Dict[str, Buying]:
     """Get all buying transactions from database"""
-    try:
-        from gpp.interface.utils.database import load_data
-        from gpp.interface.config.constants import BUYING_TRANSACTIONS_FILE
+    from gpp.interface.utils import buying_database
 
-        transactions_data = load_data(BUYING_TRANSACTIONS_FILE)
-        transactions = {}
-
-        for buying_id, buying_data in transactions_data.items():
-            try:
-                buying_obj = Buying(**buying_data)
-                transactions[buying_id] = ensure_enhanced_fields(buying_obj)
-            except Exception as e:
-                # Log error but continue with other transactions
-                print(f"Error loading transaction {buying_id}: {e}")
-
-        return transactions
-    except ImportError:
-        return {}
+    return {buying_id: ensure_enhanced_fields(buying_obj)
+            for buying_id, buying_obj in buying_database.get_all_buying_transactions().items()}
 
 
 # ===== INITIALIZATION FUNCTION =====
@@ -48,8 +48,71 @@ class PropertyChat(BaseModel):
     last_activity: datetime = Field(default_factory=datetime.now)
     is_active: bool = Field(default=True)
 
+    # Unread counters (user_id -> count), valid while unread_counted_messages matches the message total
+    # and unread_counted_notary matches the assigned notary
+    unread_by_user: Optional[Dict[str, int]] = Field(None, description="Cached unread message counts per user")
+    unread_counted_messages: int = Field(default=0, description="Message total the counters were computed for")
+    unread_counted_notary: Optional[str] = Field(None, description="Notary the counters were computed for")
+
 
 # Helper functions for chat management
+def _message_total(chat: PropertyChat) -> int:
+    """Number of messages across all channels"""
+    return len(chat.agent_notary_messages) + sum(map(len, chat.buyer_agent_chats.values()))
+
+
+def _channel_participants(chat: PropertyChat, buyer_id: str = None) -> set:
+    """Users who can read a channel: agent-notary when buyer_id is None, else that buyer's chat"""
+    participants = {chat.agent_id, chat.notary_id} if buyer_id is None else {chat.agent_id, buyer_id}
+    participants.discard(None)
+    return participants
+
+
+def _unread_counts_stale(chat: PropertyChat, message_total: int) -> bool:
+    """Whether the cached counters no longer describe the chat's messages or participants"""
+    return (chat.unread_by_user is None
+            or chat.unread_counted_messages != message_total
+            or chat.unread_counted_notary != chat.notary_id)
+
+
+def refresh_unread_counts(chat: PropertyChat) -> Dict[str, int]:
+    """Recount unread messages for every participant in one pass over the chat"""
+    counts = {}
+    channels = [(None, chat.agent_notary_messages)] + list(chat.buyer_agent_chats.items())
+    for buyer_id, messages in channels:
+        participants = _channel_participants(chat, buyer_id)
+        for msg in messages:
+            if not msg.is_read:
+                for user_id in participants:
+                    if user_id != msg.sender_id:
+                        counts[user_id] = counts.get(user_id, 0) + 1
+
+    chat.unread_by_user = counts
+    chat.unread_counted_messages = _message_total(chat)
+    chat.unread_counted_notary = chat.notary_id
+    return counts
+
+
+def note_new_message(chat: PropertyChat, message: ChatMessage, buyer_id: str = None):
+    """Count a just-appended message as unread for the other participants of its channel"""
+    if _unread_counts_stale(chat, _message_total(chat) - 1):
+        chat.unread_by_user = None  # Out of sync; recounted on next read
+        return
+
+    for user_id in _channel_participants(chat, buyer_id):
+        if user_id != message.sender_id:
+            chat.unread_by_user[user_id] = chat.unread_by_user.get(user_id, 0) + 1
+    chat.unread_counted_messages += 1
+
+
+def get_user_unread_total(chat: PropertyChat, user_id: str) -> int:
+    """Unread messages for a chat participant, recounting only when the counters are stale"""
+    counts = chat.unread_by_user
+    if _unread_counts_stale(chat, _message_total(chat)):
+        counts = refresh_unread_counts(chat)
+    return counts.get(user_id, 0)
+
+
 def create_property_chat(property_id: str, agent_id: str) -> PropertyChat:
     """Create a new property chat"""
     return PropertyChat(
@@ -71,6 +134,7 @@ def add_agent_notary_message(chat: PropertyChat, sender_id: str, sender_type: st
     )
 
     chat.agent_notary_messages.append(new_message)
+    note_new_message(chat, new_message)
     chat.last_activity = datetime.now()
 
     return chat
@@ -93,6 +157,7 @@ def add_buyer_agent_message(chat: PropertyChat, buyer_id: str, sender_id: str,
     )
 
     chat.buyer_agent_chats[buyer_id].append(new_message)
+    note_new_message(chat, new_message, buyer_id)
     chat.last_activity = datetime.now()
 
     return chat
@@ -101,6 +166,7 @@ def add_buyer_agent_message(chat: PropertyChat, buyer_id: str, sender_id: str,
 def assign_notary_to_chat(chat: PropertyChat, notary_id: str) -> PropertyChat:
     """Assign notary to property chat"""
     chat.notary_id = notary_id
+    chat.unread_by_user = None  # Participants changed; recount on next read
     return chat
 
 
@@ -184,6 +250,7 @@ def mark_messages_as_read(chat: PropertyChat, user_id: str, user_type: str,
             if msg.sender_id != user_id:
                 msg.is_read = True
 
+    refresh_unread_counts(chat)
     return chat
 
 
@@ -199,6 +266,7 @@ def add_system_message(chat: PropertyChat, message: str, target_chat: str = "age
 
     if target_chat == "agent_notary":
         chat.agent_notary_messages.append(system_message)
+        note_new_message(chat, system_message)
 
     chat.last_activity = datetime.now()
     return chat
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from decimal import Decimal
@@ -75,6 +75,9 @@ class Property(BaseModel):
         description="Dictionary of additional document categories with document ID lists"
     )
 
+    # Running total of additional documents, maintained on write
+    additional_docs_count: int = Field(default=0, description="Total number of additional documents")
+
     # NEW: Track document addition history
     document_history: List[Dict[str, Any]] = Field(
         default_factory=list,
@@ -87,6 +90,13 @@ class Property(BaseModel):
         description="Agent notes with timestamps when adding documents"
     )
 
+    @model_validator(mode="after")
+    def _init_additional_docs_count(self):
+        """Derive the additional document total for records saved without it"""
+        if "additional_docs_count" not in self.model_fields_set:
+            self.additional_docs_count = sum(len(doc_list) for doc_list in self.additional_docs.values())
+        return self
+
 
 # Helper functions for property management
 def add_document_to_property_mandatory(property_obj: Property, doc_type: str, document_id: str) -> Property:
@@ -110,6 +120,7 @@ def add_additional_document_to_property(property_obj: Property, category: str, d
     """Add additional document to property after submission"""
     if category in property_obj.additional_docs:
         property_obj.additional_docs[category].append(document_id)
+        property_obj.additional_docs_count += 1
 
         # Add to main document list
         if document_id not in property_obj.document_ids:
@@ -189,6 +200,11 @@ def get_property_additional_docs_count(property_obj: Property) -> Dict[str, int]
     return {category: len(doc_list) for category, doc_list in property_obj.additional_docs.items()}
 
 
+def get_property_additional_docs_total(property_obj: Property) -> int:
+    """Get total number of additional documents across all categories"""
+    return property_obj.additional_docs_count
+
+
 def get_property_recent_activity(property_obj: Property, limit: int = 10) -> List[Dict[str, Any]]:
     """Get recent activity on property (document additions, notes)"""
     all_activity = []
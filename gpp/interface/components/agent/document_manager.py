@@ -8,7 +8,8 @@ from datetime import datetime
 from gpp.classes.agent import Agent
 from gpp.classes.property import (
     Property, add_additional_document_to_property, replace_mandatory_document,
-    add_agent_note_to_property, get_property_additional_docs_count, get_property_recent_activity
+    add_agent_note_to_property, get_property_additional_docs_count, get_property_additional_docs_total,
+    get_property_recent_activity
 )
 from gpp.classes.document import Document
 from gpp.interface.utils.database import get_properties, save_property, get_documents, save_document
@@ -67,7 +68,7 @@ def _render_property_overview(property_id: str, selected_property: Property):
         st.metric("Validation Progress", f"{validation_progress['validated']}/{validation_progress['total']}")
 
     with col2:
-        additional_count = sum(get_property_additional_docs_count(selected_property).values())
+        additional_count = get_property_additional_docs_total(selected_property)
         st.metric("Additional Documents", additional_count)
 
     with col3:
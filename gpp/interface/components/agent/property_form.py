@@ -138,7 +138,7 @@ def _handle_property_submission(current_agent, title, price, dimension, descript
 
         photo_doc_ids = []
         if property_photos:
-            saved_photo_paths = save_multiple_files(property_photos, "photos")
+            saved_photo_paths = save_multiple_files(property_photos, "photos", silent=True)
 
             for i, (photo, file_path) in enumerate(zip(property_photos, saved_photo_paths)):
                 if file_path:  # Only create document if file was saved successfully
@@ -159,7 +159,7 @@ def _handle_property_submission(current_agent, title, price, dimension, descript
         doc_ids = {}
         for doc_key, uploaded_file in uploaded_docs.items():
             # Save file to storage
-            file_path = save_uploaded_file(uploaded_file, "documents")
+            file_path = save_uploaded_file(uploaded_file, "documents", silent=True)
 
             if file_path:  # Only create document if file was saved successfully
                 doc = Document(
@@ -4,7 +4,7 @@ Agent property list component
 
 import streamlit as st
 from gpp.classes.agent import Agent
-from gpp.classes.property import Property, get_property_additional_docs_count
+from gpp.classes.property import Property, get_property_additional_docs_total
 from gpp.classes.document import Document
 from gpp.interface.utils.database import get_properties, get_documents
 from gpp.interface.utils.property_helpers import get_property_validation_progress
@@ -54,7 +54,7 @@ def _render_property_card(prop_id: str, prop_data: Property):
                 st.write(f"📸 {photo_count} photos uploaded")
 
             # Additional documents count
-            additional_count = sum(get_property_additional_docs_count(prop_data).values())
+            additional_count = get_property_additional_docs_total(prop_data)
             if additional_count > 0:
                 st.write(f"📎 {additional_count} additional documents")
 
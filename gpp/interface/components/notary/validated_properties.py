@@ -4,7 +4,7 @@ Validated properties view for notaries
 
 import streamlit as st
 from gpp.classes.notary import Notary
-from gpp.classes.property import get_property_additional_docs_count
+from gpp.classes.property import get_property_additional_docs_total
 from gpp.interface.utils.database import get_properties
 from gpp.interface.utils.property_helpers import format_timestamp
 
@@ -36,7 +36,7 @@ def _render_validated_property_card(prop_data):
             st.write(f"€{prop_data.price:,.2f} | 📍 {prop_data.city}")
 
             # Show additional docs count if any
-            additional_count = sum(get_property_additional_docs_count(prop_data).values())
+            additional_count = get_property_additional_docs_total(prop_data)
             if additional_count > 0:
                 st.write(f"📎 {additional_count} additional documents added by agent")
 
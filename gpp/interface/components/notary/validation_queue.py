@@ -3,18 +3,22 @@ Notary validation queue interface with working document download and image viewe
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 from datetime import datetime
 import os
-import base64
+import re
 from PIL import Image
 
 from gpp.classes.notary import Notary, add_work_to_notary
-from gpp.classes.property import Property, assign_notary_to_property, get_property_additional_docs_count
+from gpp.classes.property import Property, assign_notary_to_property, get_property_additional_docs_count, \
+    get_property_additional_docs_total
 from gpp.classes.document import validate_document as validate_doc_helper
 from gpp.interface.utils.database import get_documents, save_document, save_property, load_data, save_data
 from gpp.interface.utils.property_helpers import get_pending_validation_properties, get_property_validation_progress, get_property_photos, format_timestamp
-from gpp.interface.utils.file_storage import file_exists, read_file_content, get_file_info
-from gpp.interface.config.constants import MANDATORY_DOCS, ADDITIONAL_DOC_CATEGORIES, MAX_RECENT_NOTES, NOTARIES_FILE
+from gpp.interface.utils.file_storage import file_exists, read_file_content, get_file_info, publish_static_file, \
+    read_text_content
+from gpp.interface.config.constants import MANDATORY_DOCS, ADDITIONAL_DOC_CATEGORIES, MAX_RECENT_NOTES, NOTARIES_FILE, \
+    MIME_TYPES, DEFAULT_MIME_TYPE, TEXT_VIEWER_EXTENSIONS, CODE_LANGUAGES, MAX_TEXT_PREVIEW_BYTES
 
 
 def show_validation_queue(current_notary: Notary):
@@ -62,7 +66,7 @@ def _render_pending_property_card(prop_id: str, prop_data: Property):
         st.progress(progress['progress'])
 
         # Show additional documents count
-        additional_count = sum(get_property_additional_docs_count(prop_data).values())
+        additional_count = get_property_additional_docs_total(prop_data)
         if additional_count > 0:
             st.write(f"📎 {additional_count} additional docs")
 
@@ -349,8 +353,7 @@ def _render_actual_document_preview(doc_data):
     # TEXT FILES - Show content preview
     elif file_path.endswith(('.txt', '.md', '.py', '.js', '.html', '.css')):
         try:
-            with open(doc_data.document_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_text_content(doc_data.document_path)
 
             st.info("📝 **Text Document**")
             # Show first 500 characters
@@ -423,6 +426,7 @@ def _render_fullscreen_viewer(doc_data):
         return
 
     file_path = doc_data.document_path.lower()
+    extension = file_path.rpartition('.')[2]
 
     # FULL SCREEN IMAGE VIEWER
     if file_path.endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp')):
@@ -460,58 +464,40 @@ def _render_fullscreen_viewer(doc_data):
     elif file_path.endswith('.pdf'):
         st.markdown("### 📄 PDF Viewer")
 
-        # Try to embed PDF
+        # Embed PDF by URL so the browser fetches and caches the file itself
         try:
-            with open(doc_data.document_path, "rb") as f:
-                pdf_bytes = f.read()
+            pdf_url = publish_static_file(doc_data.document_path, doc_data.document_id)
+            if not pdf_url:
+                raise FileNotFoundError(doc_data.document_path)
 
-            # Create base64 encoded PDF for embedding
-            pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-
-            # Embed PDF viewer
-            pdf_viewer = f"""
-            <iframe 
-                src="data:application/pdf;base64,{pdf_base64}" 
-                width="100%" 
-                height="800px"
-                style="border: none;">
-            </iframe>
-            """
-
-            st.markdown(pdf_viewer, unsafe_allow_html=True)
+            components.iframe(pdf_url, height=800)
 
         except Exception as e:
             st.error(f"Cannot display PDF: {str(e)}")
             st.info("💡 Download the file to view in your PDF reader")
 
     # FULL SCREEN TEXT VIEWER
-    elif file_path.endswith(('.txt', '.md', '.py', '.js', '.html', '.css', '.json')):
+    elif extension in TEXT_VIEWER_EXTENSIONS:
         try:
-            with open(doc_data.document_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            file_size = os.path.getsize(doc_data.document_path)
+            truncated = file_size > MAX_TEXT_PREVIEW_BYTES
+            content = read_text_content(doc_data.document_path, MAX_TEXT_PREVIEW_BYTES)
 
             st.markdown("### 📝 Text Document Viewer")
+            if truncated:
+                st.warning(f"Showing the first {MAX_TEXT_PREVIEW_BYTES:,} of {file_size:,} bytes. "
+                           f"Download the file to see the full content.")
 
-            # Language detection for syntax highlighting
-            language = None
-            if file_path.endswith('.py'):
-                language = 'python'
-            elif file_path.endswith('.js'):
-                language = 'javascript'
-            elif file_path.endswith('.html'):
-                language = 'html'
-            elif file_path.endswith('.css'):
-                language = 'css'
-            elif file_path.endswith('.json'):
-                language = 'json'
+            # Language detection for syntax highlighting (skipped for truncated large files)
+            language = None if truncated else CODE_LANGUAGES.get(extension)
 
             # Display content with syntax highlighting
             st.code(content, language=language)
 
-            # Document stats
-            lines = len(content.splitlines())
+            # Document stats (counted without building line/word lists)
             chars = len(content)
-            words = len(content.split())
+            lines = content.count('\n') + (1 if content and not content.endswith('\n') else 0)
+            words = sum(1 for _ in re.finditer(r'\S+', content))
             st.info(f"📊 Document stats: {lines} lines, {words} words, {chars} characters")
 
         except Exception as e:
@@ -557,31 +543,13 @@ def _get_safe_filename(doc_name, file_path):
 def _get_mime_type(file_path):
     """Get MIME type based on file extension"""
     if not file_path:
-        return "application/octet-stream"
-
-    extension = file_path.lower().split('.')[-1] if '.' in file_path else ''
-
-    mime_types = {
-        'pdf': 'application/pdf',
-        'doc': 'application/msword',
-        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'xls': 'application/vnd.ms-excel',
-        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        'jpg': 'image/jpeg',
-        'jpeg': 'image/jpeg',
-        'png': 'image/png',
-        'gif': 'image/gif',
-        'bmp': 'image/bmp',
-        'txt': 'text/plain',
-        'csv': 'text/csv',
-        'html': 'text/html',
-        'css': 'text/css',
-        'js': 'application/javascript',
-        'py': 'text/x-python',
-        'json': 'application/json'
-    }
-
-    return mime_types.get(extension, 'application/octet-stream')
+        return DEFAULT_MIME_TYPE
+
+    _, dot, extension = file_path.rpartition('.')
+    if not dot:
+        return DEFAULT_MIME_TYPE
+
+    return MIME_TYPES.get(extension.lower(), DEFAULT_MIME_TYPE)
 
 
 def _render_approval_section(property_id: str, prop_data: Property, current_notary: Notary):
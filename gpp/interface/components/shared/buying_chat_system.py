@@ -9,7 +9,7 @@ from typing import Dict, List, Optional, Any
 import uuid
 
 from gpp.classes.buying import Buying, add_transaction_note
-from gpp.classes.chat import ChatMessage, PropertyChat, create_property_chat
+from gpp.classes.chat import ChatMessage, PropertyChat, create_property_chat, note_new_message, assign_notary_to_chat
 from gpp.interface.utils.buying_database import save_buying_transaction, load_buying_transaction
 from gpp.interface.utils.chat_database import save_chat, load_chat, get_or_create_buying_chat
 
@@ -40,12 +40,14 @@ class BuyingTransactionChat:
             # Add to appropriate chat channel based on participants
             if sender_type in ["agent", "notary"]:
                 self.chat.agent_notary_messages.append(chat_message)
+                note_new_message(self.chat, chat_message)
 
             if sender_type in ["buyer", "agent"]:
                 buyer_id = self.transaction.buyer_id if sender_type == "buyer" else sender_id
                 if buyer_id not in self.chat.buyer_agent_chats:
                     self.chat.buyer_agent_chats[buyer_id] = []
                 self.chat.buyer_agent_chats[buyer_id].append(chat_message)
+                note_new_message(self.chat, chat_message, buyer_id)
 
             # Update chat metadata
             self.chat.last_activity = datetime.now()
@@ -199,8 +201,8 @@ def _show_notary_chat_interface(chat_system: BuyingTransactionChat, user_id: str
 
     # Assign notary to chat if not already assigned
     if not chat_system.chat.notary_id:
-        chat_system.chat.notary_id = user_id
-        from gpp.interface.utils.chat_database import save_chat
+        # assign_notary_to_chat also invalidates the unread counters for the new participant
+        assign_notary_to_chat(chat_system.chat, user_id)
         save_chat(chat_system.chat)
 
     messages = chat_system.get_messages_for_user(user_id, "notary")
@@ -14,7 +14,7 @@ from gpp.classes.buying import (
 )
 from gpp.interface.config.constants import (
     ENHANCED_BUYING_DOCUMENT_TYPES, ENHANCED_WORKFLOW_PHASES,
-    SIGNATURE_BUTTON_STYLES, PHASE_PROGRESSION_MESSAGES
+    SIGNATURE_BUTTON_STYLES, PHASE_PROGRESSION_MESSAGES, MIME_TYPES, DEFAULT_MIME_TYPE
 )
 from gpp.interface.utils.buying_database import save_buying_transaction
 from gpp.interface.utils.database import get_documents
@@ -474,31 +474,13 @@ def _get_safe_filename(doc_name, file_path):
 def _get_mime_type(file_path):
     """Get MIME type based on file extension"""
     if not file_path:
-        return "application/octet-stream"
-
-    extension = file_path.lower().split('.')[-1] if '.' in file_path else ''
-
-    mime_types = {
-        'pdf': 'application/pdf',
-        'doc': 'application/msword',
-        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'xls': 'application/vnd.ms-excel',
-        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        'jpg': 'image/jpeg',
-        'jpeg': 'image/jpeg',
-        'png': 'image/png',
-        'gif': 'image/gif',
-        'bmp': 'image/bmp',
-        'txt': 'text/plain',
-        'csv': 'text/csv',
-        'html': 'text/html',
-        'css': 'text/css',
-        'js': 'application/javascript',
-        'py': 'text/x-python',
-        'json': 'application/json'
-    }
-
-    return mime_types.get(extension, 'application/octet-stream')
+        return DEFAULT_MIME_TYPE
+
+    _, dot, extension = file_path.rpartition('.')
+    if not dot:
+        return DEFAULT_MIME_TYPE
+
+    return MIME_TYPES.get(extension.lower(), DEFAULT_MIME_TYPE)
 
 
 # Integration functions for dashboards (updated with download buttons for all users)
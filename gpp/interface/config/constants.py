@@ -16,7 +16,8 @@ DATA_DIR = "data"
 PROPERTIES_FILE = os.path.join(DATA_DIR, "properties.json")
 DOCUMENTS_FILE = os.path.join(DATA_DIR, "documents.json")
 AGENTS_FILE = os.path.join(DATA_DIR, "agents.json")
-BUYERS_FILE = os.path.join(DATA_DIR, "buyers.json")
+BUYERS_FILE = os.path.join(DATA_DIR, "buyers.json")  # Legacy store, moved into BUYERS_DIR by init_data_files
+BUYERS_DIR = os.path.join(DATA_DIR, "buyers")  # One JSON file per buyer
 NOTARIES_FILE = os.path.join(DATA_DIR, "notaries.json")
 BUYING_FILE = os.path.join(DATA_DIR, "buying.json")
 CHATS_FILE = os.path.join(DATA_DIR, "chats.json")  # Chat storage
@@ -24,6 +25,11 @@ CHATS_FILE = os.path.join(DATA_DIR, "chats.json")  # Chat storage
 # NEW: Add buying transactions file
 BUYING_TRANSACTIONS_FILE = os.path.join(DATA_DIR, "buying_transactions.json")
 
+# Streamlit static serving (requires server.enableStaticServing in .streamlit/config.toml)
+STATIC_DIR = "static"
+STATIC_DOCS_DIR = os.path.join(STATIC_DIR, "docs")
+STATIC_DOCS_URL = "app/static/docs"
+
 # File paths for different document types
 DOCUMENT_PATHS = {
     "photos": "/photos/",
@@ -63,6 +69,41 @@ ALLOWED_IMAGE_TYPES = ['jpg', 'jpeg', 'png']
 ALLOWED_DOCUMENT_TYPES = ['pdf', 'jpg', 'jpeg', 'png', 'doc', 'docx']
 ALLOWED_PHOTO_TYPES = ['jpg', 'jpeg', 'png']
 
+# MIME types used when serving document downloads
+MIME_TYPES = {
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'xls': 'application/vnd.ms-excel',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'bmp': 'image/bmp',
+    'txt': 'text/plain',
+    'csv': 'text/csv',
+    'html': 'text/html',
+    'css': 'text/css',
+    'js': 'application/javascript',
+    'py': 'text/x-python',
+    'json': 'application/json'
+}
+DEFAULT_MIME_TYPE = 'application/octet-stream'
+
+# Larger text files are truncated (and shown without highlighting) in the full screen viewer
+MAX_TEXT_PREVIEW_BYTES = 512 * 1024
+
+# Extensions shown in the full screen text viewer, and their syntax highlighting language
+TEXT_VIEWER_EXTENSIONS = frozenset({'txt', 'md', 'py', 'js', 'html', 'css', 'json'})
+CODE_LANGUAGES = {
+    'py': 'python',
+    'js': 'javascript',
+    'html': 'html',
+    'css': 'css',
+    'json': 'json'
+}
+
 # UI Configuration
 MAX_PHOTOS_PREVIEW = 4
 MAX_RECENT_ACTIVITY = 20
@@ -101,6 +142,17 @@ TRANSACTION_STATUSES = {
     "on_hold": "⏸️ On Hold"
 }
 
+# Emoji shown next to a transaction status
+TRANSACTION_STATUS_EMOJIS = {
+    "pending": "🟡",
+    "documents_pending": "📄",
+    "under_review": "🔍",
+    "approved": "✅",
+    "completed": "🎉",
+    "cancelled": "❌",
+    "on_hold": "⏸️"
+}
+
 # NEW: Meeting statuses
 MEETING_STATUSES = {
     "scheduled": "📅 Scheduled",
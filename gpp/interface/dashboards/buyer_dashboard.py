@@ -4,23 +4,31 @@ Replace your existing _show_buyer_documents function with the enhanced version
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
+import os
+import re
 from typing import Dict, List, Optional
 from datetime import datetime
+from PIL import Image
 from gpp.classes.buyer import Buyer, add_interest_to_buyer
-from gpp.classes.property import get_property_additional_docs_count
-from gpp.interface.utils.database import get_documents, load_data, save_data, get_properties
+from gpp.classes.property import get_property_additional_docs_total
+from gpp.interface.utils.database import get_documents, get_properties, get_property, save_buyer
 from gpp.interface.utils.property_helpers import get_validated_properties, get_property_validation_progress, \
-    get_property_photos
+    get_property_photos_index
 from gpp.interface.components.buyer.chat_management import buyer_chat_dashboard
 from gpp.interface.config.constants import (
-    BUYERS_FILE, MANDATORY_DOCS, ADDITIONAL_DOC_CATEGORIES,
-    BUYING_DOCUMENT_TYPES, TRANSACTION_STATUSES, TRANSACTION_NOTE_TYPES
+    MANDATORY_DOCS, ADDITIONAL_DOC_CATEGORIES,
+    BUYING_DOCUMENT_TYPES, TRANSACTION_STATUSES, TRANSACTION_NOTE_TYPES,
+    MIME_TYPES, DEFAULT_MIME_TYPE, TRANSACTION_STATUS_EMOJIS, ENHANCED_BUYING_DOCUMENT_TYPES,
+    TEXT_VIEWER_EXTENSIONS, CODE_LANGUAGES, MAX_TEXT_PREVIEW_BYTES
 )
 from gpp.interface.utils.buying_database import get_user_buying_transactions
+from gpp.interface.utils.file_storage import (
+    file_exists, read_file_content, get_file_info, publish_static_file, read_text_content
+)
 from gpp.interface.components.shared.document_signing_ui import (
     show_signing_workflow_dashboard, integrate_signing_with_buyer_dashboard, show_document_upload_modal
 )
-from gpp.interface.utils.buying_database import get_user_buying_transactions
 
 
 def buyer_dashboard(current_buyer: Buyer):
@@ -140,8 +148,7 @@ def _handle_property_selection(buying_transactions: Dict) -> Optional[object]:
 
 def _show_transaction_overview(transaction):
     """Show transaction overview with key metrics"""
-    all_properties = get_properties()
-    property_data = all_properties.get(transaction.property_id)
+    property_data = get_property(transaction.property_id)
 
     if not property_data:
         st.error("Property data not found.")
@@ -171,8 +178,7 @@ def _show_transaction_overview(transaction):
         st.metric("Legal Documents", mandatory_count)
 
     with col2:
-        additional_count = sum(len(docs) for docs in property_data.additional_docs.values())
-        st.metric("Additional Documents", additional_count)
+        st.metric("Additional Documents", property_data.additional_docs_count)
 
     with col3:
         transaction_docs = len([doc_id for doc_id in transaction.buying_documents.values() if doc_id])
@@ -214,8 +220,7 @@ def _show_enhanced_mandatory_documents(transaction):
     st.subheader("📋 Mandatory Legal Documents")
     st.caption("Required legal documents validated by notary")
 
-    all_properties = get_properties()
-    property_data = all_properties.get(transaction.property_id)
+    property_data = get_property(transaction.property_id)
     documents = get_documents()
 
     if not property_data:
@@ -270,8 +275,7 @@ def _show_enhanced_additional_documents(transaction):
     st.subheader("📎 Additional Property Documents")
     st.caption("Supplementary documents provided by the agent")
 
-    all_properties = get_properties()
-    property_data = all_properties.get(transaction.property_id)
+    property_data = get_property(transaction.property_id)
     documents = get_documents()
 
     if not property_data:
@@ -533,9 +537,6 @@ def _render_timeline_event(event):
 
 def _handle_document_download(document, doc_name: str):
     """Handle document download with actual file serving"""
-    from gpp.interface.utils.file_storage import file_exists, read_file_content, get_file_info
-    import os
-
     if not file_exists(document.document_path):
         st.error(f"📥 File not available: {doc_name}")
         st.warning("The document file could not be found in storage.")
@@ -567,11 +568,6 @@ def _handle_document_download(document, doc_name: str):
 
 def _show_document_viewer(document, doc_name: str):
     """Enhanced document viewer with actual image display and working download like notary interface"""
-    from gpp.interface.utils.file_storage import file_exists, read_file_content, get_file_info
-    from PIL import Image
-    import base64
-    import os
-
     st.markdown("---")
     st.markdown("### 📄 Document Viewer")
 
@@ -642,8 +638,6 @@ def _show_document_viewer(document, doc_name: str):
 
 def _render_download_button(document, doc_name: str):
     """Render working download button exactly like notary interface"""
-    from gpp.interface.utils.file_storage import file_exists, read_file_content, get_file_info
-
     if not file_exists(document.document_path):
         st.button("📥 Download", disabled=True, help="File not available")
         return False
@@ -671,9 +665,6 @@ def _render_download_button(document, doc_name: str):
 
 def _render_actual_document_preview(document):
     """Render actual document preview with real content like notary interface"""
-    from gpp.interface.utils.file_storage import file_exists, get_file_info
-    from PIL import Image
-
     if not file_exists(document.document_path):
         st.error("📄 **File Not Found**")
         st.write("File is not available in storage")
@@ -710,8 +701,7 @@ def _render_actual_document_preview(document):
     # TEXT FILES - Show content preview
     elif file_path.endswith(('.txt', '.md', '.py', '.js', '.html', '.css')):
         try:
-            with open(document.document_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_text_content(document.document_path)
 
             st.info("📝 **Text Document**")
             # Show first 500 characters
@@ -753,10 +743,6 @@ def _render_actual_document_preview(document):
 
 def _render_fullscreen_viewer(document, doc_name: str):
     """Render full screen document viewer with actual content like notary interface"""
-    from gpp.interface.utils.file_storage import file_exists, get_file_info
-    from PIL import Image
-    import base64
-
     st.markdown("---")
     st.markdown("### 🔍 Full Screen Document Viewer")
 
@@ -788,6 +774,7 @@ def _render_fullscreen_viewer(document, doc_name: str):
         return
 
     file_path = document.document_path.lower()
+    extension = file_path.rpartition('.')[2]
 
     # FULL SCREEN IMAGE VIEWER
     if file_path.endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp')):
@@ -825,58 +812,40 @@ def _render_fullscreen_viewer(document, doc_name: str):
     elif file_path.endswith('.pdf'):
         st.markdown("### 📄 PDF Viewer")
 
-        # Try to embed PDF
+        # Embed PDF by URL so the browser fetches and caches the file itself
         try:
-            with open(document.document_path, "rb") as f:
-                pdf_bytes = f.read()
-
-            # Create base64 encoded PDF for embedding
-            pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
+            pdf_url = publish_static_file(document.document_path, document.document_id)
+            if not pdf_url:
+                raise FileNotFoundError(document.document_path)
 
-            # Embed PDF viewer
-            pdf_viewer = f"""
-            <iframe 
-                src="data:application/pdf;base64,{pdf_base64}" 
-                width="100%" 
-                height="800px"
-                style="border: none;">
-            </iframe>
-            """
-
-            st.markdown(pdf_viewer, unsafe_allow_html=True)
+            components.iframe(pdf_url, height=800)
 
         except Exception as e:
             st.error(f"Cannot display PDF: {str(e)}")
             st.info("💡 Download the file to view in your PDF reader")
 
     # FULL SCREEN TEXT VIEWER
-    elif file_path.endswith(('.txt', '.md', '.py', '.js', '.html', '.css', '.json')):
+    elif extension in TEXT_VIEWER_EXTENSIONS:
         try:
-            with open(document.document_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            file_size = os.path.getsize(document.document_path)
+            truncated = file_size > MAX_TEXT_PREVIEW_BYTES
+            content = read_text_content(document.document_path, MAX_TEXT_PREVIEW_BYTES)
 
             st.markdown("### 📝 Text Document Viewer")
+            if truncated:
+                st.warning(f"Showing the first {MAX_TEXT_PREVIEW_BYTES:,} of {file_size:,} bytes. "
+                           f"Download the file to see the full content.")
 
-            # Language detection for syntax highlighting
-            language = None
-            if file_path.endswith('.py'):
-                language = 'python'
-            elif file_path.endswith('.js'):
-                language = 'javascript'
-            elif file_path.endswith('.html'):
-                language = 'html'
-            elif file_path.endswith('.css'):
-                language = 'css'
-            elif file_path.endswith('.json'):
-                language = 'json'
+            # Language detection for syntax highlighting (skipped for truncated large files)
+            language = None if truncated else CODE_LANGUAGES.get(extension)
 
             # Display content with syntax highlighting
             st.code(content, language=language)
 
-            # Document stats
-            lines = len(content.splitlines())
+            # Document stats (counted without building line/word lists)
             chars = len(content)
-            words = len(content.split())
+            lines = content.count('\n') + (1 if content and not content.endswith('\n') else 0)
+            words = sum(1 for _ in re.finditer(r'\S+', content))
             st.info(f"📊 Document stats: {lines} lines, {words} words, {chars} characters")
 
         except Exception as e:
@@ -906,8 +875,6 @@ def _render_fullscreen_viewer(document, doc_name: str):
 
 def _get_safe_filename(doc_name, file_path):
     """Get a safe filename for download"""
-    import os
-
     if doc_name and '.' in doc_name:
         return doc_name
 
@@ -924,76 +891,36 @@ def _get_safe_filename(doc_name, file_path):
 def _get_mime_type(file_path):
     """Get MIME type based on file extension"""
     if not file_path:
-        return "application/octet-stream"
-
-    extension = file_path.lower().split('.')[-1] if '.' in file_path else ''
-
-    mime_types = {
-        'pdf': 'application/pdf',
-        'doc': 'application/msword',
-        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'xls': 'application/vnd.ms-excel',
-        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        'jpg': 'image/jpeg',
-        'jpeg': 'image/jpeg',
-        'png': 'image/png',
-        'gif': 'image/gif',
-        'bmp': 'image/bmp',
-        'txt': 'text/plain',
-        'csv': 'text/csv',
-        'html': 'text/html',
-        'css': 'text/css',
-        'js': 'application/javascript',
-        'py': 'text/x-python',
-        'json': 'application/json'
-    }
+        return DEFAULT_MIME_TYPE
+
+    _, dot, extension = file_path.rpartition('.')
+    if not dot:
+        return DEFAULT_MIME_TYPE
 
-    return mime_types.get(extension, 'application/octet-stream')
+    return MIME_TYPES.get(extension.lower(), DEFAULT_MIME_TYPE)
 
 
 def _get_status_emoji(status: str) -> str:
     """Get emoji for transaction status"""
-    return {
-        "pending": "🟡",
-        "documents_pending": "📄",
-        "under_review": "🔍",
-        "approved": "✅",
-        "completed": "🎉",
-        "cancelled": "❌",
-        "on_hold": "⏸️"
-    }.get(status, "⚪")
-    """Get emoji for transaction status"""
-    return {
-        "pending": "🟡",
-        "documents_pending": "📄",
-        "under_review": "🔍",
-        "approved": "✅",
-        "completed": "🎉",
-        "cancelled": "❌",
-        "on_hold": "⏸️"
-    }.get(status, "⚪")
+    return TRANSACTION_STATUS_EMOJIS.get(status, "⚪")
 
 
 def _calculate_document_progress(transaction, property_data) -> Dict:
     """Calculate overall document validation progress"""
 
-    total_documents = 0
-    validated_documents = 0
-
     # Count mandatory documents
     documents = get_documents()
-    for doc_id in property_data.mandatory_legal_docs.values():
-        if doc_id and doc_id in documents:
-            total_documents += 1
-            if documents[doc_id].validation_status:
-                validated_documents += 1
+    mandatory_ids = [doc_id for doc_id in property_data.mandatory_legal_docs.values()
+                     if doc_id and doc_id in documents]
+    total_documents = len(mandatory_ids)
+    validated_documents = sum(1 for doc_id in mandatory_ids if documents[doc_id].validation_status)
 
     # Count transaction documents
-    for doc_type, validation_info in transaction.document_validation_status.items():
-        if transaction.buying_documents.get(doc_type):
-            total_documents += 1
-            if validation_info.get("validation_status", False):
-                validated_documents += 1
+    uploaded_statuses = [validation_info for doc_type, validation_info in transaction.document_validation_status.items()
+                         if transaction.buying_documents.get(doc_type)]
+    total_documents += len(uploaded_statuses)
+    validated_documents += sum(1 for validation_info in uploaded_statuses
+                               if validation_info.get("validation_status", False))
 
     percentage = (validated_documents / total_documents * 100) if total_documents > 0 else 0
 
@@ -1080,9 +1007,7 @@ def _show_buyer_favorites(current_buyer: Buyer):
                 if st.button("💔 Remove", key=f"remove_fav_{prop_id}"):
                     # Remove from favorites
                     current_buyer.interested_properties.remove(prop_id)
-                    buyers = load_data(BUYERS_FILE)
-                    buyers[current_buyer.buyer_id] = current_buyer.dict()
-                    save_data(BUYERS_FILE, buyers)
+                    save_buyer(current_buyer)
                     st.success("Removed from favorites!")
                     st.rerun()
 
@@ -1103,34 +1028,54 @@ def _show_debug_info():
 
 def _display_property_grid(validated_properties, current_buyer):
     """Display properties in a grid layout"""
+    # Properties this buyer already has a transaction for
+    buying_transactions = get_user_buying_transactions(current_buyer.buyer_id, "buyer")
+    reserved_property_ids = {t.property_id for t in buying_transactions.values()}
+    photos_index = get_property_photos_index()
+
     cols = st.columns(2)
 
     for i, (prop_id, prop_data) in enumerate(validated_properties.items()):
         with cols[i % 2]:
-            _render_property_card(prop_id, prop_data, current_buyer)
+            _render_property_card(prop_id, prop_data, current_buyer, prop_id in reserved_property_ids,
+                                  photos_index.get(prop_id, []))
 
         if i % 2 == 1:  # Add spacing after every two properties
             st.write("")
 
 
-def _render_property_card(prop_id: str, prop_data, current_buyer: Buyer):
+@st.cache_resource(max_entries=512, show_spinner=False)
+def _load_thumbnail(path: str, mtime: float, max_width: int = 400):
+    """Decode a property photo and shrink it to card size, once per file version"""
+    image = Image.open(path)
+    image.thumbnail((max_width, max_width))
+    return image
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _photo_mtime(path: str) -> Optional[float]:
+    """Return the photo's mtime, or None if it is missing (one stat per file per TTL)"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _render_property_card(prop_id: str, prop_data, current_buyer: Buyer, has_reserved: bool, photo_docs: List):
     """Render individual property card for buyers with actual image display"""
     with st.container():
         # Show property photos if available - ENHANCED WITH ACTUAL IMAGES
-        photo_docs = get_property_photos(prop_data)
-
         if photo_docs:
             # Show first photo + count if multiple
-            from PIL import Image
-            from gpp.interface.utils.file_storage import file_exists
-
             first_photo = photo_docs[0]  # Get first photo document
 
-            if file_exists(first_photo.document_path):
+            photo_mtime = _photo_mtime(first_photo.document_path)
+
+            if photo_mtime is not None:
                 try:
                     # Display actual image
-                    image = Image.open(first_photo.document_path)
-                    st.image(image, caption=prop_data.title, use_container_width=True)
+                    image = _load_thumbnail(first_photo.document_path, photo_mtime)
+                    st.image(image, caption=prop_data.title, width=350, output_format="JPEG")
 
                     # Show photo count if multiple
                     if len(photo_docs) > 1:
@@ -1165,14 +1110,11 @@ def _render_property_card(prop_id: str, prop_data, current_buyer: Buyer):
         st.success("✅ Fully Validated by Notary")
 
         # Show if property has additional documentation
-        additional_count = sum(get_property_additional_docs_count(prop_data).values())
+        additional_count = get_property_additional_docs_total(prop_data)
         if additional_count > 0:
             st.info(f"📎 {additional_count} additional documents available")
 
         # Check if buyer has reserved this property
-        buying_transactions = get_user_buying_transactions(current_buyer.buyer_id, "buyer")
-        has_reserved = any(t.property_id == prop_id for t in buying_transactions.values())
-
         if has_reserved:
             st.success("🎉 You have reserved this property!")
 
@@ -1196,9 +1138,7 @@ def _render_property_card(prop_id: str, prop_data, current_buyer: Buyer):
                     st.success("Added to favorites!")
 
                 # Save changes
-                buyers = load_data(BUYERS_FILE)
-                buyers[current_buyer.buyer_id] = current_buyer.dict()
-                save_data(BUYERS_FILE, buyers)
+                save_buyer(current_buyer)
                 st.rerun()
 
         with col2:
@@ -1231,10 +1171,9 @@ def _show_buyer_signing_dashboard(current_buyer: Buyer):
 
     # Transaction selector if multiple transactions
     if len(buying_transactions) > 1:
+        properties = get_properties()
         transaction_options = {}
         for txn_id, txn in buying_transactions.items():
-            from gpp.interface.utils.database import get_properties
-            properties = get_properties()
             prop_data = properties.get(txn.property_id)
             display_name = f"{prop_data.title if prop_data else txn.property_id[:8]}... - {txn.status}"
             transaction_options[display_name] = txn
@@ -1248,13 +1187,9 @@ def _show_buyer_signing_dashboard(current_buyer: Buyer):
         selected_transaction = list(buying_transactions.values())[0]
 
     # Show signing workflow for selected transaction
-    from gpp.interface.components.shared.document_signing_ui import show_signing_workflow_dashboard
     show_signing_workflow_dashboard(selected_transaction, current_buyer, "buyer")
 
     # Handle document upload modals
-    from gpp.interface.components.shared.document_signing_ui import show_document_upload_modal
-    from gpp.interface.config.constants import ENHANCED_BUYING_DOCUMENT_TYPES
-
     for doc_type in ENHANCED_BUYING_DOCUMENT_TYPES.keys():
         if st.session_state.get(f"upload_doc_{doc_type}"):
             show_document_upload_modal(selected_transaction, doc_type, current_buyer, "buyer")
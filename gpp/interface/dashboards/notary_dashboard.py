@@ -3,14 +3,24 @@ Notary Dashboard - Document validation interface for notaries
 """
 
 import streamlit as st
+from typing import Dict
 from gpp.classes.notary import Notary
+from gpp.classes.buying import Buying, can_user_sign_document
 from gpp.interface.components.notary.validation_queue import show_validation_queue
 from gpp.interface.components.notary.validated_properties import show_validated_properties
 from gpp.interface.components.notary.chat_management import notary_chat_dashboard
 from gpp.interface.components.shared.document_signing_ui import (
-    show_signing_workflow_dashboard, integrate_signing_with_notary_dashboard
+    show_signing_workflow_dashboard, integrate_signing_with_notary_dashboard, show_document_upload_modal
 )
+from gpp.interface.config.constants import ENHANCED_BUYING_DOCUMENT_TYPES
 from gpp.interface.utils.buying_database import get_all_buying_transactions
+from gpp.interface.utils.database import get_properties
+
+# Document types the notary uploads / signs, resolved once at import
+_NOTARY_UPLOAD_DOCS = [(doc_type, doc_config) for doc_type, doc_config in ENHANCED_BUYING_DOCUMENT_TYPES.items()
+                       if "notary" in doc_config.get("uploadable_by", [])]
+_NOTARY_SIGN_DOCS = [(doc_type, doc_config) for doc_type, doc_config in ENHANCED_BUYING_DOCUMENT_TYPES.items()
+                     if "notary" in doc_config.get("required_signers", [])]
 
 
 def notary_dashboard(current_notary: Notary):
@@ -60,102 +70,27 @@ def _show_notary_signing_dashboard(current_notary: Notary):
 
     # Show transaction statistics
     total_transactions = len(notary_transactions)
-    pending_validations = 0
-    pending_signatures = 0
-    documents_to_upload = 0
-
-    for txn in notary_transactions.values():
-        # Check for pending validations
-        for doc_type, validation_status in txn.document_validation_status.items():
-            if txn.buying_documents.get(doc_type) and not validation_status.get("validation_status", False):
-                pending_validations += 1
-                break
-
-        # Check for documents to upload and signatures
-        from gpp.interface.config.constants import ENHANCED_BUYING_DOCUMENT_TYPES
-        from gpp.classes.buying import can_user_sign_document
-
-        for doc_type, doc_config in ENHANCED_BUYING_DOCUMENT_TYPES.items():
-            # Check if notary needs to upload document
-            if ("notary" in doc_config.get("uploadable_by", []) and
-                    not txn.buying_documents.get(doc_type)):
-                documents_to_upload += 1
-
-            # Check if notary needs to sign
-            elif "notary" in doc_config.get("required_signers", []):
-                if txn.buying_documents.get(doc_type):
-                    can_sign, _ = can_user_sign_document(txn, doc_type, current_notary.notary_id, "notary")
-                    if can_sign:
-                        pending_signatures += 1
+    snapshot_key = tuple(sorted((txn_id, txn.last_updated) for txn_id, txn in notary_transactions.items()))
+    metrics, priority_actions = _compute_notary_workload(
+        current_notary.notary_id, snapshot_key, notary_transactions
+    )
 
     # Statistics display
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("Active Transactions", total_transactions)
     with col2:
-        st.metric("Pending Validations", pending_validations)
+        st.metric("Pending Validations", metrics["pending_validations"])
     with col3:
-        st.metric("Documents to Upload", documents_to_upload)
+        st.metric("Documents to Upload", metrics["documents_to_upload"])
     with col4:
-        st.metric("Pending Signatures", pending_signatures)
+        st.metric("Pending Signatures", metrics["pending_signatures"])
 
     st.markdown("---")
 
     # Priority Actions Section
     st.subheader("🚨 Priority Actions")
 
-    priority_actions = []
-
-    for txn_id, txn in notary_transactions.items():
-        from gpp.interface.utils.database import get_properties
-        properties = get_properties()
-        prop_data = properties.get(txn.property_id)
-        property_name = prop_data.title if prop_data else txn.property_id[:8] + "..."
-
-        # Check for documents to upload
-        from gpp.interface.config.constants import ENHANCED_BUYING_DOCUMENT_TYPES
-        for doc_type, doc_config in ENHANCED_BUYING_DOCUMENT_TYPES.items():
-            if ("notary" in doc_config.get("uploadable_by", []) and
-                    not txn.buying_documents.get(doc_type)):
-                priority_actions.append({
-                    "type": "upload",
-                    "action": f"Upload {doc_config['name']}",
-                    "property": property_name,
-                    "transaction_id": txn_id,
-                    "doc_type": doc_type,
-                    "priority": "high"
-                })
-
-        # Check for documents to validate
-        for doc_type, validation_status in txn.document_validation_status.items():
-            if (txn.buying_documents.get(doc_type) and
-                    not validation_status.get("validation_status", False)):
-                doc_config = ENHANCED_BUYING_DOCUMENT_TYPES.get(doc_type, {})
-                priority_actions.append({
-                    "type": "validate",
-                    "action": f"Validate {doc_config.get('name', doc_type)}",
-                    "property": property_name,
-                    "transaction_id": txn_id,
-                    "doc_type": doc_type,
-                    "priority": "high"
-                })
-
-        # Check for documents to sign
-        from gpp.classes.buying import can_user_sign_document
-        for doc_type, doc_config in ENHANCED_BUYING_DOCUMENT_TYPES.items():
-            if "notary" in doc_config.get("required_signers", []):
-                if txn.buying_documents.get(doc_type):
-                    can_sign, _ = can_user_sign_document(txn, doc_type, current_notary.notary_id, "notary")
-                    if can_sign:
-                        priority_actions.append({
-                            "type": "sign",
-                            "action": f"Sign {doc_config['name']}",
-                            "property": property_name,
-                            "transaction_id": txn_id,
-                            "doc_type": doc_type,
-                            "priority": "medium"
-                        })
-
     # Display priority actions
     if priority_actions:
         for action in priority_actions:
@@ -184,9 +119,9 @@ def _show_notary_signing_dashboard(current_notary: Notary):
     if len(notary_transactions) > 1:
         st.subheader("📋 Detailed Transaction View")
 
+        properties = get_properties()
         transaction_options = {}
         for txn_id, txn in notary_transactions.items():
-            properties = get_properties()
             prop_data = properties.get(txn.property_id)
             display_name = f"{prop_data.title if prop_data else txn.property_id[:8]}... - {txn.status} - Phase: {txn.current_phase}"
             transaction_options[display_name] = txn
@@ -201,14 +136,74 @@ def _show_notary_signing_dashboard(current_notary: Notary):
         selected_transaction = list(notary_transactions.values())[0]
 
     # Show signing workflow for selected transaction
-    from gpp.interface.components.shared.document_signing_ui import show_signing_workflow_dashboard
     show_signing_workflow_dashboard(selected_transaction, current_notary, "notary")
 
     # Handle document upload modals
-    from gpp.interface.components.shared.document_signing_ui import show_document_upload_modal
-    from gpp.interface.config.constants import ENHANCED_BUYING_DOCUMENT_TYPES
-
     for doc_type in ENHANCED_BUYING_DOCUMENT_TYPES.keys():
         if st.session_state.get(f"upload_doc_{doc_type}"):
             show_document_upload_modal(selected_transaction, doc_type, current_notary, "notary")
-            break
\ No newline at end of file
+            break
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _compute_notary_workload(notary_id: str, snapshot_key: tuple, _transactions: Dict[str, Buying]):
+    """
+    Compute dashboard metrics and priority actions for a notary in one pass
+
+    snapshot_key identifies the transaction state (ID and last update of each transaction);
+    the transactions themselves are not hashed by the cache.
+    """
+    properties = get_properties()
+    metrics = {"pending_validations": 0, "documents_to_upload": 0, "pending_signatures": 0}
+    priority_actions = []
+
+    for txn_id, txn in _transactions.items():
+        prop_data = properties.get(txn.property_id)
+        property_name = prop_data.title if prop_data else txn.property_id[:8] + "..."
+
+        # Check for documents to upload
+        for doc_type, doc_config in _NOTARY_UPLOAD_DOCS:
+            if not txn.buying_documents.get(doc_type):
+                metrics["documents_to_upload"] += 1
+                priority_actions.append({
+                    "type": "upload",
+                    "action": f"Upload {doc_config['name']}",
+                    "property": property_name,
+                    "transaction_id": txn_id,
+                    "doc_type": doc_type,
+                    "priority": "high"
+                })
+
+        # Check for documents to validate
+        pending_validation_docs = [
+            doc_type for doc_type, validation_status in txn.document_validation_status.items()
+            if txn.buying_documents.get(doc_type) and not validation_status.get("validation_status", False)
+        ]
+        metrics["pending_validations"] += bool(pending_validation_docs)
+        for doc_type in pending_validation_docs:
+            doc_config = ENHANCED_BUYING_DOCUMENT_TYPES.get(doc_type, {})
+            priority_actions.append({
+                "type": "validate",
+                "action": f"Validate {doc_config.get('name', doc_type)}",
+                "property": property_name,
+                "transaction_id": txn_id,
+                "doc_type": doc_type,
+                "priority": "high"
+            })
+
+        # Check for documents to sign
+        for doc_type, doc_config in _NOTARY_SIGN_DOCS:
+            if txn.buying_documents.get(doc_type):
+                can_sign, _ = can_user_sign_document(txn, doc_type, notary_id, "notary")
+                if can_sign:
+                    metrics["pending_signatures"] += 1
+                    priority_actions.append({
+                        "type": "sign",
+                        "action": f"Sign {doc_config['name']}",
+                        "property": property_name,
+                        "transaction_id": txn_id,
+                        "doc_type": doc_type,
+                        "priority": "medium"
+                    })
+
+    return metrics, priority_actions
\ No newline at end of file
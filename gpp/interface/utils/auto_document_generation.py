@@ -3,6 +3,7 @@ Automatic Document Generation System
 Handles creation of reservation agreements and contracts after payment success
 """
 
+import logging
 import os
 from datetime import datetime
 from decimal import Decimal
@@ -10,10 +11,42 @@ from typing import Dict, Any, Optional
 
 from gpp.classes.buying import Buying, add_document_to_buying, add_transaction_note
 from gpp.classes.document import Document
-from gpp.interface.utils.database import save_document, get_properties, get_agents, get_buyers
+from gpp.interface.utils.database import save_document, get_properties, get_agents, get_buyers, IO_BUFFER_SIZE
 from gpp.interface.utils.buying_database import save_buying_transaction
 from gpp.interface.config.constants import ENHANCED_BUYING_DOCUMENT_TYPES
 
+logger = logging.getLogger(__name__)
+
+# Payment split of the purchase price
+RESERVATION_FEE_RATE = Decimal("0.05")
+DEPOSIT_RATE = Decimal("0.10")
+FINAL_PAYMENT_RATE = Decimal("1") - RESERVATION_FEE_RATE - DEPOSIT_RATE  # 85%
+
+
+# Output directories already created by this process
+_ENSURED_DIRS = set()
+
+
+def _write_document_file(file_path: str, content: str):
+    """Write generated document text as UTF-8 bytes, creating its directory once per process"""
+    directory = os.path.dirname(file_path)
+    if directory not in _ENSURED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+
+    data = content.encode('utf-8')
+    with open(file_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        f.write(data)
+
+
+def _fetch_transaction_context(buying_obj: Buying):
+    """Look up the property, agent and buyer of a transaction from the cached stores"""
+    return (
+        get_properties().get(buying_obj.property_id),
+        get_agents().get(buying_obj.agent_id),
+        get_buyers().get(buying_obj.buyer_id),
+    )
+
 
 def generate_reservation_agreement(buying_obj: Buying) -> bool:
     """
@@ -22,32 +55,23 @@ def generate_reservation_agreement(buying_obj: Buying) -> bool:
     """
     try:
         # Get transaction details
-        properties = get_properties()
-        agents = get_agents()
-        buyers = get_buyers()
-
-        property_data = properties.get(buying_obj.property_id)
-        agent_data = agents.get(buying_obj.agent_id)
-        buyer_data = buyers.get(buying_obj.buyer_id)
+        property_data, agent_data, buyer_data = _fetch_transaction_context(buying_obj)
 
         if not all([property_data, agent_data, buyer_data]):
             return False
 
         # Generate reservation agreement content
+        now = datetime.now()
         agreement_content = _create_reservation_agreement_content(
-            property_data, agent_data, buyer_data, buying_obj
+            property_data, agent_data, buyer_data, buying_obj, now
         )
 
         # Create document file
-        filename = f"reservation_agreement_{buying_obj.buying_id}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+        filename = f"reservation_agreement_{buying_obj.buying_id}_{now:%Y%m%d_%H%M}.txt"
         file_path = os.path.join("data", "files", "buying_documents", filename)
 
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
         # Write agreement content to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(agreement_content)
+        _write_document_file(file_path, agreement_content)
 
         # Create document record
         doc = Document(
@@ -78,21 +102,25 @@ def generate_reservation_agreement(buying_obj: Buying) -> bool:
         save_buying_transaction(buying_obj)
         return True
 
-    except Exception as e:
-        print(f"Error generating reservation agreement: {e}")
+    except Exception:
+        logger.exception("Error generating reservation agreement for transaction %s", buying_obj.buying_id)
         return False
 
 
-def _create_reservation_agreement_content(property_data, agent_data, buyer_data, buying_obj: Buying) -> str:
+def _create_reservation_agreement_content(property_data, agent_data, buyer_data, buying_obj: Buying,
+                                          now: Optional[datetime] = None) -> str:
     """Create the content for reservation agreement"""
 
-    reservation_fee = buying_obj.final_price * Decimal(
-        "0.05") if buying_obj.final_price else property_data.price * Decimal("0.05")
+    effective_price = buying_obj.final_price or property_data.price
+    reservation_fee = effective_price * RESERVATION_FEE_RATE
+    agent_contact = getattr(agent_data, 'contact_info', 'N/A')
+    buyer_contact = getattr(buyer_data, 'contact_info', 'N/A')
+    now = now or datetime.now()
 
     content = f"""
 PROPERTY RESERVATION AGREEMENT
 
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated on: {now:%Y-%m-%d %H:%M:%S}
 Transaction ID: {buying_obj.buying_id}
 
 === PROPERTY DETAILS ===
@@ -104,17 +132,17 @@ Price: €{property_data.price:,.2f}
 === PARTIES ===
 AGENT:
 - ID: {agent_data.agent_id}
-- Contact: {getattr(agent_data, 'contact_info', 'N/A')}
+- Contact: {agent_contact}
 
 BUYER:
 - ID: {buyer_data.buyer_id}
-- Contact: {getattr(buyer_data, 'contact_info', 'N/A')}
+- Contact: {buyer_contact}
 
 === RESERVATION TERMS ===
 1. The buyer hereby reserves the above property for purchase
 2. Reservation fee paid: €{reservation_fee:,.2f} (5% of property price)
 3. Reservation valid for 30 days from date of payment
-4. Total purchase price: €{buying_obj.final_price or property_data.price:,.2f}
+4. Total purchase price: €{effective_price:,.2f}
 
 === NEXT STEPS ===
 1. Buyer must provide proof of funds or mortgage pre-approval
@@ -146,33 +174,24 @@ def generate_preliminary_contract(buying_obj: Buying, notary_id: str,
     """
     try:
         # Get transaction details
-        properties = get_properties()
-        agents = get_agents()
-        buyers = get_buyers()
-
-        property_data = properties.get(buying_obj.property_id)
-        agent_data = agents.get(buying_obj.agent_id)
-        buyer_data = buyers.get(buying_obj.buyer_id)
+        property_data, agent_data, buyer_data = _fetch_transaction_context(buying_obj)
 
         if not all([property_data, agent_data, buyer_data]):
             return False
 
         # Generate preliminary contract content
+        now = datetime.now()
         contract_content = _create_preliminary_contract_content(
             property_data, agent_data, buyer_data, buying_obj,
-            contract_terms, special_conditions
+            contract_terms, special_conditions, now
         )
 
         # Create document file
-        filename = f"preliminary_contract_{buying_obj.buying_id}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+        filename = f"preliminary_contract_{buying_obj.buying_id}_{now:%Y%m%d_%H%M}.txt"
         file_path = os.path.join("data", "files", "buying_documents", filename)
 
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
         # Write contract content to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(contract_content)
+        _write_document_file(file_path, contract_content)
 
         # Create document record
         doc = Document(
@@ -198,22 +217,29 @@ def generate_preliminary_contract(buying_obj: Buying, notary_id: str,
         save_buying_transaction(buying_obj)
         return True
 
-    except Exception as e:
-        print(f"Error generating preliminary contract: {e}")
+    except Exception:
+        logger.exception("Error generating preliminary contract for transaction %s", buying_obj.buying_id)
         return False
 
 
 def _create_preliminary_contract_content(property_data, agent_data, buyer_data, buying_obj: Buying,
-                                         contract_terms: str, special_conditions: str) -> str:
+                                         contract_terms: str, special_conditions: str,
+                                         now: Optional[datetime] = None) -> str:
     """Create the content for preliminary contract"""
 
-    deposit_amount = buying_obj.final_price * Decimal(
-        "0.10") if buying_obj.final_price else property_data.price * Decimal("0.10")
+    effective_price = buying_obj.final_price or property_data.price
+    deposit_amount = effective_price * DEPOSIT_RATE
+    # Amounts that appear more than once are formatted once
+    price_str = f"{effective_price:,.2f}"
+    deposit_str = f"{deposit_amount:,.2f}"
+    agent_contact = getattr(agent_data, 'contact_info', 'N/A')
+    buyer_contact = getattr(buyer_data, 'contact_info', 'N/A')
+    now = now or datetime.now()
 
     content = f"""
 PRELIMINARY PURCHASE CONTRACT
 
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated on: {now:%Y-%m-%d %H:%M:%S}
 Transaction ID: {buying_obj.buying_id}
 Contract prepared by: Notary
 
@@ -221,20 +247,20 @@ Contract prepared by: Notary
 Property: {property_data.title}
 Address: {property_data.address}, {property_data.city}
 Size: {property_data.dimension}
-Agreed Purchase Price: €{buying_obj.final_price or property_data.price:,.2f}
+Agreed Purchase Price: €{price_str}
 
 === CONTRACTING PARTIES ===
 SELLER (represented by Agent):
 - Agent ID: {agent_data.agent_id}
-- Contact: {getattr(agent_data, 'contact_info', 'N/A')}
+- Contact: {agent_contact}
 
 BUYER:
 - ID: {buyer_data.buyer_id}
-- Contact: {getattr(buyer_data, 'contact_info', 'N/A')}
+- Contact: {buyer_contact}
 
 === CONTRACT TERMS ===
-1. PURCHASE PRICE: €{buying_obj.final_price or property_data.price:,.2f}
-2. DEPOSIT REQUIRED: €{deposit_amount:,.2f} (10% of purchase price)
+1. PURCHASE PRICE: €{price_str}
+2. DEPOSIT REQUIRED: €{deposit_str} (10% of purchase price)
 3. DEPOSIT DUE: Within 7 days of contract signing
 4. COMPLETION DATE: 30 days from deposit payment
 
@@ -243,7 +269,7 @@ BUYER:
 {f"SPECIAL CONDITIONS:{chr(10)}{special_conditions}" if special_conditions else ""}
 
 === DEPOSIT PAYMENT TERMS ===
-- Deposit amount: €{deposit_amount:,.2f}
+- Deposit amount: €{deposit_str}
 - Payment method: Bank transfer or certified check
 - Deposit held in escrow until completion
 - Upon completion, deposit applied to final purchase price
@@ -283,32 +309,23 @@ def generate_final_purchase_contract(buying_obj: Buying, notary_id: str) -> bool
     """
     try:
         # Get transaction details
-        properties = get_properties()
-        agents = get_agents()
-        buyers = get_buyers()
-
-        property_data = properties.get(buying_obj.property_id)
-        agent_data = agents.get(buying_obj.agent_id)
-        buyer_data = buyers.get(buying_obj.buyer_id)
+        property_data, agent_data, buyer_data = _fetch_transaction_context(buying_obj)
 
         if not all([property_data, agent_data, buyer_data]):
             return False
 
         # Generate final contract content
+        now = datetime.now()
         contract_content = _create_final_contract_content(
-            property_data, agent_data, buyer_data, buying_obj
+            property_data, agent_data, buyer_data, buying_obj, now
         )
 
         # Create document file
-        filename = f"final_contract_{buying_obj.buying_id}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+        filename = f"final_contract_{buying_obj.buying_id}_{now:%Y%m%d_%H%M}.txt"
         file_path = os.path.join("data", "files", "buying_documents", filename)
 
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
         # Write contract content to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(contract_content)
+        _write_document_file(file_path, contract_content)
 
         # Create document record
         doc = Document(
@@ -334,22 +351,27 @@ def generate_final_purchase_contract(buying_obj: Buying, notary_id: str) -> bool
         save_buying_transaction(buying_obj)
         return True
 
-    except Exception as e:
-        print(f"Error generating final contract: {e}")
+    except Exception:
+        logger.exception("Error generating final contract for transaction %s", buying_obj.buying_id)
         return False
 
 
-def _create_final_contract_content(property_data, agent_data, buyer_data, buying_obj: Buying) -> str:
+def _create_final_contract_content(property_data, agent_data, buyer_data, buying_obj: Buying,
+                                   now: Optional[datetime] = None) -> str:
     """Create the content for final purchase contract"""
 
-    final_payment = buying_obj.final_price - (
-                buying_obj.final_price * Decimal("0.15")) if buying_obj.final_price else property_data.price * Decimal(
-        "0.85")
+    effective_price = buying_obj.final_price or property_data.price
+    final_payment = effective_price * FINAL_PAYMENT_RATE
+    # Amounts that appear more than once are formatted once
+    price_str = f"{effective_price:,.2f}"
+    agent_contact = getattr(agent_data, 'contact_info', 'N/A')
+    buyer_contact = getattr(buyer_data, 'contact_info', 'N/A')
+    now = now or datetime.now()
 
     content = f"""
 FINAL PURCHASE CONTRACT
 
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated on: {now:%Y-%m-%d %H:%M:%S}
 Transaction ID: {buying_obj.buying_id}
 Contract prepared by: Notary
 
@@ -357,21 +379,21 @@ Contract prepared by: Notary
 Property: {property_data.title}
 Address: {property_data.address}, {property_data.city}
 Size: {property_data.dimension}
-Final Purchase Price: €{buying_obj.final_price or property_data.price:,.2f}
+Final Purchase Price: €{price_str}
 
 === CONTRACTING PARTIES ===
 SELLER (represented by Agent):
 - Agent ID: {agent_data.agent_id}
-- Contact: {getattr(agent_data, 'contact_info', 'N/A')}
+- Contact: {agent_contact}
 
 BUYER:
 - ID: {buyer_data.buyer_id}
-- Contact: {getattr(buyer_data, 'contact_info', 'N/A')}
+- Contact: {buyer_contact}
 
 === FINANCIAL SUMMARY ===
-Total Purchase Price: €{buying_obj.final_price or property_data.price:,.2f}
-Less: Reservation Fee: €{(buying_obj.final_price or property_data.price) * Decimal('0.05'):,.2f}
-Less: Deposit Paid: €{(buying_obj.final_price or property_data.price) * Decimal('0.10'):,.2f}
+Total Purchase Price: €{price_str}
+Less: Reservation Fee: €{effective_price * RESERVATION_FEE_RATE:,.2f}
+Less: Deposit Paid: €{effective_price * DEPOSIT_RATE:,.2f}
 FINAL PAYMENT DUE: €{final_payment:,.2f}
 
 === COMPLETION TERMS ===
@@ -402,7 +424,7 @@ DIGITAL SIGNATURES REQUIRED:
 - Buyer: {buyer_data.buyer_id}
 - Agent: {agent_data.agent_id} (on behalf of seller)
 
-CONTRACT EXECUTION DATE: {datetime.now().strftime('%Y-%m-%d')}
+CONTRACT EXECUTION DATE: {now:%Y-%m-%d}
 Generated by GPP - Global Property Platform
 """.strip()
 
@@ -422,20 +444,17 @@ def generate_notary_validation_certificate(buying_obj: Buying, notary_id: str) -
             return False
 
         # Generate certificate content
+        now = datetime.now()
         certificate_content = _create_validation_certificate_content(
-            property_data, buying_obj, notary_id
+            property_data, buying_obj, notary_id, now
         )
 
         # Create document file
-        filename = f"notary_certificate_{buying_obj.buying_id}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+        filename = f"notary_certificate_{buying_obj.buying_id}_{now:%Y%m%d_%H%M}.txt"
         file_path = os.path.join("data", "files", "buying_documents", filename)
 
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
         # Write certificate content to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(certificate_content)
+        _write_document_file(file_path, certificate_content)
 
         # Create document record
         doc = Document(
@@ -461,19 +480,22 @@ def generate_notary_validation_certificate(buying_obj: Buying, notary_id: str) -
         save_buying_transaction(buying_obj)
         return True
 
-    except Exception as e:
-        print(f"Error generating validation certificate: {e}")
+    except Exception:
+        logger.exception("Error generating validation certificate for transaction %s", buying_obj.buying_id)
         return False
 
 
-def _create_validation_certificate_content(property_data, buying_obj: Buying, notary_id: str) -> str:
+def _create_validation_certificate_content(property_data, buying_obj: Buying, notary_id: str,
+                                           now: Optional[datetime] = None) -> str:
     """Create the content for notary validation certificate"""
+    effective_price = buying_obj.final_price or property_data.price
+    now = now or datetime.now()
 
     content = f"""
 NOTARY VALIDATION CERTIFICATE
 
-Certificate ID: CERT_{buying_obj.buying_id}_{datetime.now().strftime('%Y%m%d_%H%M')}
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Certificate ID: CERT_{buying_obj.buying_id}_{now:%Y%m%d_%H%M}
+Generated on: {now:%Y-%m-%d %H:%M:%S}
 Transaction ID: {buying_obj.buying_id}
 
 === NOTARIAL CERTIFICATION ===
@@ -482,7 +504,7 @@ I, as authorized notary, hereby certify that:
 === PROPERTY TRANSACTION DETAILS ===
 Property: {property_data.title}
 Address: {property_data.address}, {property_data.city}
-Transaction Value: €{buying_obj.final_price or property_data.price:,.2f}
+Transaction Value: €{effective_price:,.2f}
 Transaction Phase: {buying_obj.current_phase}
 
 === DOCUMENT VALIDATION STATUS ===
@@ -508,12 +530,12 @@ This transaction has been completed in accordance with:
 - Due diligence requirements
 
 TRANSACTION STATUS: LEGALLY COMPLETE
-EFFECTIVE DATE: {datetime.now().strftime('%Y-%m-%d')}
+EFFECTIVE DATE: {now:%Y-%m-%d}
 
 === NOTARIAL SEAL ===
 Notary ID: {notary_id}
 Digital Signature Required: ✓
-Date of Certification: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Date of Certification: {now:%Y-%m-%d %H:%M:%S}
 
 This certificate serves as official confirmation that the property transaction
 has been completed in accordance with all legal requirements.
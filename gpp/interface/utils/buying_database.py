@@ -4,80 +4,205 @@ Database utilities for buying transaction system
 
 import json
 import os
+import re
+import threading
+from contextlib import contextmanager
+import streamlit as st
 from typing import Dict, Optional
 from datetime import datetime
 from decimal import Decimal
 
+try:
+    import fcntl
+except ImportError:  # Windows: only sessions of this process are serialized
+    fcntl = None
+
 from gpp.classes.buying import Buying
-from gpp.interface.utils.database import load_data, save_data
+from gpp.interface.utils.database import load_data, save_data, decode_json, encode_json
 
 # File paths
 BUYING_TRANSACTIONS_FILE = "data/buying_transactions.json"
+BUYING_TRANSACTIONS_WAL = "data/buying_transactions.wal"  # Append-only log replayed over the snapshot
+BUYING_TRANSACTIONS_COMPACTING = "data/buying_transactions.wal.compacting"  # Log being folded into the snapshot
+BUYING_TRANSACTIONS_LOCK = "data/buying_transactions.wal.lock"  # flock'ed while the store is read or written
+
+# Transaction fields with an in-memory lookup index
+_INDEXED_FIELDS = ("agent_id", "buyer_id", "property_id", "status")
+
+# Fold the log back into the snapshot once it grows past this size
+WAL_COMPACT_BYTES = 1024 * 1024
+
+# Strings that look like serialized datetimes (YYYY-MM-DDTHH:MM:SS...)
+_ISO_DATETIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+
+_initialized = False
+
+# Streamlit sessions are threads of one process; this serializes them
+_store_lock = threading.Lock()
 
 
 def init_buying_database():
-    """Initialize buying transactions database file"""
+    """Initialize buying transactions database file (once per process)"""
+    global _initialized
+    if _initialized:
+        return
+
     if not os.path.exists(BUYING_TRANSACTIONS_FILE):
         save_data(BUYING_TRANSACTIONS_FILE, {})
+    _initialized = True
+
+
+@contextmanager
+def _locked_store():
+    """Hold the store lock, so a read, an append or a compaction never sees another one half done"""
+    with _store_lock:
+        if fcntl is None:
+            yield
+            return
+        # Other processes (e.g. a second server) serialize on the lock file
+        with open(BUYING_TRANSACTIONS_LOCK, 'ab') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _append_wal(record: dict):
+    """Append one change record to the transactions log, compacting it when it gets large"""
+    line = encode_json(record, indent=False) + b'\n'
+    with _locked_store():
+        with open(BUYING_TRANSACTIONS_WAL, 'a+b') as f:
+            # An interrupted append can leave a partial last line; start on a fresh one
+            # so the new record is not glued onto it
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            wal_size = f.tell()
+
+        if wal_size > WAL_COMPACT_BYTES:
+            _compact_wal()
+
+    # Cached loaders read the log too; drop them so the next rerun sees this write
+    st.cache_data.clear()
+
+
+def _replay_log(transactions: dict, log_path: str):
+    """Apply the records of one log file to transactions, in place"""
+    try:
+        with open(log_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = decode_json(line)
+                except ValueError:
+                    continue  # Torn line from an interrupted append; later records still count
 
+                if record["op"] == "upsert":
+                    transactions[record["id"]] = record["data"]
+                elif record["op"] == "delete":
+                    transactions.pop(record["id"], None)
+    except FileNotFoundError:
+        pass
 
-def save_buying_transaction(buying_obj: Buying):
-    """Save buying transaction to database"""
-    init_buying_database()
 
-    # Load existing transactions
-    transactions = load_data(BUYING_TRANSACTIONS_FILE)
+def _load_transactions_data() -> dict:
+    """Load the transactions snapshot and replay the logs on top of it"""
+    with _locked_store():
+        transactions = load_data(BUYING_TRANSACTIONS_FILE)
+
+        # A log left by an interrupted compaction is older than the live one, so it is replayed first
+        _replay_log(transactions, BUYING_TRANSACTIONS_COMPACTING)
+        _replay_log(transactions, BUYING_TRANSACTIONS_WAL)
 
-    # Convert to dict and handle datetime/decimal serialization
-    transaction_dict = buying_obj.dict()
-
-    # Convert datetime objects to ISO strings
-    def convert_datetime(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, Decimal):
-            return float(obj)
-        elif isinstance(obj, dict):
-            return {k: convert_datetime(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_datetime(item) for item in obj]
-        return obj
-
-    transaction_dict = convert_datetime(transaction_dict)
-
-    # Save transaction
-    transactions[buying_obj.buying_id] = transaction_dict
+    return transactions
+
+
+def _compact_wal():
+    """Fold the log into the snapshot (the caller holds _locked_store)"""
+    # Move the log aside first: if the snapshot write is interrupted, the side file
+    # is still replayed by readers and folded by the next compaction
+    if not os.path.exists(BUYING_TRANSACTIONS_COMPACTING):
+        try:
+            os.replace(BUYING_TRANSACTIONS_WAL, BUYING_TRANSACTIONS_COMPACTING)
+        except FileNotFoundError:
+            return
+
+    transactions = load_data(BUYING_TRANSACTIONS_FILE)
+    _replay_log(transactions, BUYING_TRANSACTIONS_COMPACTING)
+    _replay_log(transactions, BUYING_TRANSACTIONS_WAL)
     save_data(BUYING_TRANSACTIONS_FILE, transactions)
 
+    os.remove(BUYING_TRANSACTIONS_COMPACTING)
+    try:
+        os.remove(BUYING_TRANSACTIONS_WAL)
+    except FileNotFoundError:
+        pass
+
+
+def _store_version() -> tuple:
+    """Modification times of the snapshot and the logs, used as a cache key"""
+    mtimes = []
+    for file_path in (BUYING_TRANSACTIONS_FILE, BUYING_TRANSACTIONS_COMPACTING, BUYING_TRANSACTIONS_WAL):
+        try:
+            mtimes.append(os.stat(file_path).st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(0)
+    return tuple(mtimes)
+
+
+def save_buying_transaction(buying_obj: Buying):
+    """Save buying transaction to database"""
+    # encode_json writes datetimes as ISO strings and Decimals as strings
+    _append_wal({"op": "upsert", "id": buying_obj.buying_id, "data": buying_obj.dict()})
+
 
 def load_buying_transaction(buying_id: str) -> Optional[Buying]:
     """Load buying transaction from database"""
-    init_buying_database()
-
-    transactions = load_data(BUYING_TRANSACTIONS_FILE)
+    transactions = _load_transactions_data()
 
     if buying_id not in transactions:
         return None
 
-    transaction_dict = transactions[buying_id]
+    return _transaction_from_dict(transactions[buying_id])
+
+
+def _parse_datetime(value):
+    """Turn an ISO datetime string back into a datetime; other values are returned unchanged"""
+    # Only strings shaped like a datetime are worth parsing
+    if isinstance(value, str) and _ISO_DATETIME_RE.match(value):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _convert_leaves(root, fn):
+    """Apply fn to every non-container value of a nested dict/list, in place, without recursion"""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+            else:
+                node[key] = fn(value)
+    return root
 
-    # Convert ISO strings back to datetime objects
-    def convert_from_json(obj):
-        if isinstance(obj, str):
-            # Try to parse as datetime
-            for fmt in ["%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"]:
-                try:
-                    return datetime.strptime(obj, fmt)
-                except ValueError:
-                    continue
-            return obj
-        elif isinstance(obj, dict):
-            return {k: convert_from_json(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_from_json(item) for item in obj]
-        return obj
 
-    transaction_dict = convert_from_json(transaction_dict)
+def _transaction_from_dict(transaction_dict: dict) -> Buying:
+    """Build a Buying object from its stored JSON representation"""
+    # Convert ISO strings back to datetime objects (the dict is freshly decoded, so it is safe to mutate)
+    _convert_leaves(transaction_dict, _parse_datetime)
 
     # Convert final_price back to Decimal if it exists
     if transaction_dict.get('final_price') is not None:
@@ -88,46 +213,96 @@ def load_buying_transaction(buying_id: str) -> Optional[Buying]:
 
 def get_all_buying_transactions() -> Dict[str, Buying]:
     """Get all buying transactions from database"""
-    init_buying_database()
+    return _load_all_buying_transactions(_store_version())
 
-    transactions_dict = load_data(BUYING_TRANSACTIONS_FILE)
-    transactions = {}
 
-    for buying_id, transaction_data in transactions_dict.items():
-        transaction = load_buying_transaction(buying_id)
-        if transaction:
-            transactions[buying_id] = transaction
+@st.cache_data(max_entries=1, show_spinner=False)
+def _load_all_buying_transactions(store_version: tuple) -> Dict[str, Buying]:
+    """Parse the transactions snapshot and log once per modification time"""
+    transactions_dict = _load_transactions_data()
 
-    return transactions
+    return {
+        buying_id: _transaction_from_dict(transaction_data)
+        for buying_id, transaction_data in transactions_dict.items()
+    }
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _load_transaction_index(store_version: tuple) -> Dict[str, Dict]:
+    """Map agent, buyer, property and status values to transaction IDs, once per modification time"""
+    index = {field: {} for field in _INDEXED_FIELDS}
+    position = {}
+
+    for buying_id, transaction_data in _load_transactions_data().items():
+        position[buying_id] = len(position)
+        for field in _INDEXED_FIELDS:
+            index[field].setdefault(transaction_data.get(field), []).append(buying_id)
+
+    index["position"] = position
+    return index
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _load_transactions_by(store_version: tuple, field: str, values: tuple) -> Dict[str, Buying]:
+    """Transactions whose field matches one of values, in file order"""
+    index = _load_transaction_index(store_version)
+    buying_ids = [buying_id for value in values for buying_id in index[field].get(value, [])]
+    if len(values) > 1:
+        buying_ids.sort(key=index["position"].get)
+
+    all_transactions = _load_all_buying_transactions(store_version)
+    return {buying_id: all_transactions[buying_id] for buying_id in buying_ids}
+
+
+def _get_transactions_by(field: str, *values) -> Dict[str, Buying]:
+    """Look transactions up through the field index instead of scanning them all"""
+    return _load_transactions_by(_store_version(), field, values)
 
 
 def get_user_buying_transactions(user_id: str, user_type: str) -> Dict[str, Buying]:
     """Get buying transactions relevant to a specific user"""
-    all_transactions = get_all_buying_transactions()
-    relevant_transactions = {}
+    if user_type == "agent":
+        return _get_transactions_by("agent_id", user_id)
+    elif user_type == "buyer":
+        return _get_transactions_by("buyer_id", user_id)
+    elif user_type == "notary":
+        # Notaries see all transactions that need validation
+        return _get_transactions_by("status", "documents_pending", "under_review")
+
+    return {}
+
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _find_buying_id(store_version: tuple, user_id: str, user_type: str, property_id: str) -> Optional[str]:
+    """First transaction (in file order) for property_id among those get_user_buying_transactions returns"""
+    index = _load_transaction_index(store_version)
+
+    if user_type == "agent":
+        user_ids = set(index["agent_id"].get(user_id, []))
+    elif user_type == "buyer":
+        user_ids = set(index["buyer_id"].get(user_id, []))
+    elif user_type == "notary":
+        user_ids = set(index["status"].get("documents_pending", []) + index["status"].get("under_review", []))
+    else:
+        return None
+
+    for buying_id in index["property_id"].get(property_id, []):
+        if buying_id in user_ids:
+            return buying_id
+    return None
 
-    for buying_id, buying_obj in all_transactions.items():
-        if user_type == "agent" and buying_obj.agent_id == user_id:
-            relevant_transactions[buying_id] = buying_obj
-        elif user_type == "buyer" and buying_obj.buyer_id == user_id:
-            relevant_transactions[buying_id] = buying_obj
-        elif user_type == "notary":
-            # Notaries see all transactions that need validation
-            if buying_obj.status in ["documents_pending", "under_review"]:
-                relevant_transactions[buying_id] = buying_obj
 
-    return relevant_transactions
+def get_buying_id_for(user_id: str, user_type: str, property_id: str) -> Optional[str]:
+    """ID of a transaction for property_id visible to the user, without loading their transactions"""
+    return _find_buying_id(_store_version(), user_id, user_type, property_id)
 
 
 def delete_buying_transaction(buying_id: str) -> bool:
     """Delete buying transaction from database"""
-    init_buying_database()
-
-    transactions = load_data(BUYING_TRANSACTIONS_FILE)
+    transactions = _load_transactions_data()
 
     if buying_id in transactions:
-        del transactions[buying_id]
-        save_data(BUYING_TRANSACTIONS_FILE, transactions)
+        _append_wal({"op": "delete", "id": buying_id})
         return True
 
     return False
@@ -135,21 +310,12 @@ def delete_buying_transaction(buying_id: str) -> bool:
 
 def get_buying_transactions_by_property(property_id: str) -> Dict[str, Buying]:
     """Get all buying transactions for a specific property"""
-    all_transactions = get_all_buying_transactions()
-
-    return {
-        buying_id: transaction
-        for buying_id, transaction in all_transactions.items()
-        if transaction.property_id == property_id
-    }
+    return _get_transactions_by("property_id", property_id)
 
 
 def get_active_buying_transactions() -> Dict[str, Buying]:
     """Get all active buying transactions (not completed or cancelled)"""
-    all_transactions = get_all_buying_transactions()
-
-    return {
-        buying_id: transaction
-        for buying_id, transaction in all_transactions.items()
-        if transaction.status not in ["completed", "cancelled"]
-    }
\ No newline at end of file
+    statuses = _load_transaction_index(_store_version())["status"]
+    return _get_transactions_by("status", *[
+        status for status in statuses if status not in ["completed", "cancelled"]
+    ])
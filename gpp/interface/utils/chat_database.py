@@ -3,61 +3,96 @@ Chat database operations
 Extended with buying transaction chat functionality
 """
 
-import json
+import functools
+import heapq
 import os
+from collections import Counter
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 import streamlit as st
 
-from gpp.classes.chat import PropertyChat, ChatMessage
+from gpp.classes.chat import (
+    PropertyChat, ChatMessage, create_property_chat, get_user_unread_total, refresh_unread_counts
+)
 from gpp.interface.config.constants import DATA_DIR
+from gpp.interface.utils.database import IO_BUFFER_SIZE, atomic_write, decode_json, encode_json
+from gpp.interface.utils.buying_database import get_all_buying_transactions, load_buying_transaction
 
 # Chat data files
 CHATS_FILE = os.path.join(DATA_DIR, "chats.json")
 BUYING_CHATS_FILE = os.path.join(DATA_DIR, "buying_chats.json")
 
 
+_chat_storage_initialized = False
+
+
 def init_chat_storage():
-    """Initialize chat storage files"""
+    """Initialize chat storage files (once per process)"""
+    global _chat_storage_initialized
+    if _chat_storage_initialized:
+        return
+
     # Initialize regular property chats
     if not os.path.exists(CHATS_FILE):
-        with open(CHATS_FILE, 'w') as f:
-            json.dump({}, f)
+        with open(CHATS_FILE, 'wb') as f:
+            f.write(encode_json({}))
 
     # Initialize buying transaction chats
     if not os.path.exists(BUYING_CHATS_FILE):
-        with open(BUYING_CHATS_FILE, 'w') as f:
-            json.dump({}, f)
+        with open(BUYING_CHATS_FILE, 'wb') as f:
+            f.write(encode_json({}))
 
+    _chat_storage_initialized = True
 
-def load_chat_data() -> dict:
-    """Load regular property chat data from file"""
+
+# Parsed chat files keyed by path: (st_mtime_ns, data)
+_chat_cache = {}
+
+# Participant -> buying chat IDs, for the buying_chats.json version in "mtime"
+_buying_chat_index = {"mtime": None, "index": {}}
+
+
+def _load_cached(file_path: str) -> dict:
+    """Load a chat file, reusing the parsed data while the file's mtime is unchanged"""
     try:
-        with open(CHATS_FILE, 'r') as f:
-            return json.load(f)
-    except:
+        mtime = os.stat(file_path).st_mtime_ns
+        cached = _chat_cache.get(file_path)
+        if cached is None or cached[0] != mtime:
+            with open(file_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+                cached = (mtime, decode_json(f.read()))
+            _chat_cache[file_path] = cached
+    except FileNotFoundError:
         return {}
 
+    # Shallow copy so callers adding or removing chats don't touch the cache
+    return dict(cached[1])
+
+
+def _save_cached(file_path: str, data: dict):
+    """Write a chat file and keep the written data as its cached contents"""
+    payload = encode_json(data)
+    atomic_write(file_path, payload)
+    _chat_cache[file_path] = (os.stat(file_path).st_mtime_ns, decode_json(payload))
+
+
+def load_chat_data() -> dict:
+    """Load regular property chat data from file"""
+    return _load_cached(CHATS_FILE)
+
 
 def load_buying_chat_data() -> dict:
     """Load buying transaction chat data from file"""
-    try:
-        with open(BUYING_CHATS_FILE, 'r') as f:
-            return json.load(f)
-    except:
-        return {}
+    return _load_cached(BUYING_CHATS_FILE)
 
 
 def save_chat_data(data: dict):
     """Save regular property chat data to file"""
-    with open(CHATS_FILE, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    _save_cached(CHATS_FILE, data)
 
 
 def save_buying_chat_data(data: dict):
     """Save buying transaction chat data to file"""
-    with open(BUYING_CHATS_FILE, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    _save_cached(BUYING_CHATS_FILE, data)
 
 
 def get_property_chat(property_id: str) -> Optional[PropertyChat]:
@@ -84,22 +119,21 @@ def get_all_chats_for_user(user_id: str, user_type: str) -> Dict[str, PropertyCh
     user_chats = {}
 
     for property_id, chat_data in data.items():
-        try:
-            chat = PropertyChat(**chat_data)
-
-            # Check if user is participant
-            is_participant = False
+        # Check participation on the raw data so only the user's chats are validated into models
+        is_participant = False
 
-            if user_type == "agent" and chat.agent_id == user_id:
-                is_participant = True
-            elif user_type == "notary" and chat.notary_id == user_id:
-                is_participant = True
-            elif user_type == "buyer" and user_id in chat.buyer_ids:
-                is_participant = True
+        if user_type == "agent" and chat_data.get("agent_id") == user_id:
+            is_participant = True
+        elif user_type == "notary" and chat_data.get("notary_id") == user_id:
+            is_participant = True
+        elif user_type == "buyer" and user_id in (chat_data.get("buyer_ids") or []):
+            is_participant = True
 
-            if is_participant:
-                user_chats[property_id] = chat
+        if not is_participant:
+            continue
 
+        try:
+            user_chats[property_id] = PropertyChat(**chat_data)
         except Exception as e:
             st.error(f"Error loading chat {property_id}: {e}")
 
@@ -114,7 +148,6 @@ def create_or_get_property_chat(property_id: str, agent_id: str) -> PropertyChat
         return existing_chat
 
     # Create new chat
-    from gpp.classes.chat import create_property_chat
     new_chat = create_property_chat(property_id, agent_id)
     save_property_chat(new_chat)
     return new_chat
@@ -124,32 +157,55 @@ def create_or_get_property_chat(property_id: str, agent_id: str) -> PropertyChat
 # BUYING TRANSACTION CHAT FUNCTIONS
 # ================================
 
-def convert_datetime_to_json(obj):
-    """Convert datetime objects to ISO strings for JSON serialization"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {k: convert_datetime_to_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_datetime_to_json(item) for item in obj]
-    return obj
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(value: str):
+    """Parse an ISO datetime string, or return it unchanged; timestamps repeat a lot across messages"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def _is_iso_candidate(value: str) -> bool:
+    """Cheap shape check so only strings like YYYY-MM-DDTHH:MM:SS are parsed"""
+    return len(value) >= 19 and value[4] == '-' and value[7] == '-' and value[10] == 'T'
 
 
 def convert_datetime_from_json(obj):
     """Convert ISO strings back to datetime objects"""
-    if isinstance(obj, str):
-        # Try to parse as datetime
-        for fmt in ["%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"]:
-            try:
-                return datetime.strptime(obj, fmt)
-            except ValueError:
-                continue
+    kind = type(obj)
+    if kind is str:
+        return _parse_iso(obj) if _is_iso_candidate(obj) else obj
+    if kind is not dict and kind is not list:
         return obj
-    elif isinstance(obj, dict):
-        return {k: convert_datetime_from_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_datetime_from_json(item) for item in obj]
-    return obj
+
+    # Walk with an explicit stack; containers are copied so the cached raw data stays untouched
+    root = obj.copy()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for key, value in (node.items() if type(node) is dict else enumerate(node)):
+            kind = type(value)
+            if kind is str:
+                if _is_iso_candidate(value):
+                    node[key] = _parse_iso(value)
+            elif kind is dict or kind is list:
+                value = value.copy()
+                node[key] = value
+                stack.append(value)
+    return root
+
+
+def _construct_chat(chat_dict: dict) -> PropertyChat:
+    """Build a PropertyChat from our own stored (already validated) data, skipping validation"""
+    chat_dict["agent_notary_messages"] = [
+        ChatMessage.model_construct(**msg) for msg in chat_dict.get("agent_notary_messages", [])
+    ]
+    chat_dict["buyer_agent_chats"] = {
+        buyer_id: [ChatMessage.model_construct(**msg) for msg in messages]
+        for buyer_id, messages in chat_dict.get("buyer_agent_chats", {}).items()
+    }
+    return PropertyChat.model_construct(**chat_dict)
 
 
 def get_buying_chat(chat_id: str) -> Optional[PropertyChat]:
@@ -158,7 +214,7 @@ def get_buying_chat(chat_id: str) -> Optional[PropertyChat]:
     if chat_id in data:
         try:
             chat_dict = convert_datetime_from_json(data[chat_id])
-            return PropertyChat(**chat_dict)
+            return _construct_chat(chat_dict)
         except Exception as e:
             st.error(f"Error loading buying chat {chat_id}: {e}")
     return None
@@ -167,15 +223,13 @@ def get_buying_chat(chat_id: str) -> Optional[PropertyChat]:
 def save_buying_chat(chat: PropertyChat):
     """Save buying transaction chat"""
     data = load_buying_chat_data()
-    chat_dict = convert_datetime_to_json(chat.dict())
-    data[chat.chat_id] = chat_dict
+    # encode_json writes datetimes as ISO strings itself
+    data[chat.chat_id] = chat.dict()
     save_buying_chat_data(data)
 
 
 def get_or_create_buying_chat(transaction_id: str) -> PropertyChat:
     """Get or create chat for buying transaction"""
-    from gpp.interface.utils.buying_database import load_buying_transaction
-
     chat_id = f"buying_{transaction_id}"
 
     # Try to load existing chat
@@ -206,61 +260,107 @@ def get_or_create_buying_chat(transaction_id: str) -> PropertyChat:
     return chat
 
 
+def _buying_chats_version() -> int:
+    """Modification time of buying_chats.json, used as the cache key for chat views"""
+    try:
+        return os.stat(BUYING_CHATS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
 def get_all_buying_chats() -> Dict[str, PropertyChat]:
     """Get all buying transaction chats"""
+    return _load_all_buying_chats(_buying_chats_version())
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _load_all_buying_chats(file_version: int) -> Dict[str, PropertyChat]:
+    """Build every buying chat once per modification time"""
     data = load_buying_chat_data()
     chats = {}
 
     for chat_id, chat_data in data.items():
         try:
             chat_dict = convert_datetime_from_json(chat_data)
-            chats[chat_id] = PropertyChat(**chat_dict)
+            chats[chat_id] = _construct_chat(chat_dict)
         except Exception as e:
             st.error(f"Error loading buying chat {chat_id}: {e}")
 
     return chats
 
 
+def _get_buying_chat_index(data: dict) -> Dict[tuple, List[str]]:
+    """Map (user_type, user_id) to buying chat IDs, rebuilt only when buying_chats.json changes"""
+    mtime = _chat_cache.get(BUYING_CHATS_FILE, (None,))[0]
+    if mtime is None or _buying_chat_index["mtime"] != mtime:
+        index = {}
+        for chat_id, chat_data in data.items():
+            index.setdefault(("agent", chat_data.get("agent_id")), []).append(chat_id)
+            for buyer_id in chat_data.get("buyer_ids") or []:
+                index.setdefault(("buyer", buyer_id), []).append(chat_id)
+            if chat_data.get("notary_id"):
+                index.setdefault(("notary", chat_data["notary_id"]), []).append(chat_id)
+        _buying_chat_index["mtime"] = mtime
+        _buying_chat_index["index"] = index
+    return _buying_chat_index["index"]
+
+
 def get_user_buying_chats(user_id: str, user_type: str) -> Dict[str, PropertyChat]:
     """Get buying chats relevant to a specific user"""
-    all_chats = get_all_buying_chats()
+    return _load_user_buying_chats(_buying_chats_version(), user_id, user_type)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _load_user_buying_chats(file_version: int, user_id: str, user_type: str) -> Dict[str, PropertyChat]:
+    """Build a user's buying chats once per modification time"""
+    data = load_buying_chat_data()
     relevant_chats = {}
 
-    for chat_id, chat in all_chats.items():
-        if user_type == "agent" and chat.agent_id == user_id:
-            relevant_chats[chat_id] = chat
-        elif user_type == "buyer" and user_id in chat.buyer_ids:
-            relevant_chats[chat_id] = chat
-        elif user_type == "notary" and chat.notary_id == user_id:
-            relevant_chats[chat_id] = chat
+    for chat_id in _get_buying_chat_index(data).get((user_type, user_id), []):
+        try:
+            relevant_chats[chat_id] = _construct_chat(convert_datetime_from_json(data[chat_id]))
+        except Exception as e:
+            st.error(f"Error loading buying chat {chat_id}: {e}")
 
     return relevant_chats
 
 
-def get_unread_messages_count(chat: PropertyChat, user_id: str, user_type: str) -> int:
-    """Get count of unread messages for a user in a chat"""
-    unread_count = 0
+def _unread_for_agent(chat: PropertyChat, user_id: str) -> int:
+    """Unread agent-notary and buyer messages for an agent, by scanning"""
+    return (
+        sum(1 for msg in chat.agent_notary_messages if msg.sender_id != user_id and not msg.is_read) +
+        sum(1 for messages in chat.buyer_agent_chats.values()
+            for msg in messages if msg.sender_id != user_id and not msg.is_read)
+    )
 
-    if user_type in ["agent", "notary"]:
-        # Check agent-notary messages
-        for msg in chat.agent_notary_messages:
-            if msg.sender_id != user_id and not msg.is_read:
-                unread_count += 1
 
-    if user_type == "agent":
-        # Check all buyer chats for agent
-        for buyer_id, messages in chat.buyer_agent_chats.items():
-            for msg in messages:
-                if msg.sender_id != user_id and not msg.is_read:
-                    unread_count += 1
-    elif user_type == "buyer":
-        # Check this buyer's chat with agent
-        buyer_messages = chat.buyer_agent_chats.get(user_id, [])
-        for msg in buyer_messages:
-            if msg.sender_id != user_id and not msg.is_read:
-                unread_count += 1
+def _unread_for_notary(chat: PropertyChat, user_id: str) -> int:
+    """Unread agent-notary messages for a notary, by scanning"""
+    return sum(1 for msg in chat.agent_notary_messages if msg.sender_id != user_id and not msg.is_read)
+
+
+def _unread_for_buyer(chat: PropertyChat, user_id: str) -> int:
+    """Unread messages in a buyer's own chat with the agent, by scanning"""
+    return sum(1 for msg in chat.buyer_agent_chats.get(user_id, ()) if msg.sender_id != user_id and not msg.is_read)
+
 
-    return unread_count
+_UNREAD_SCANNERS = {
+    "agent": _unread_for_agent,
+    "notary": _unread_for_notary,
+    "buyer": _unread_for_buyer,
+}
+
+
+def get_unread_messages_count(chat: PropertyChat, user_id: str, user_type: str) -> int:
+    """Get count of unread messages for a user in a chat"""
+    if ((user_type == "agent" and user_id == chat.agent_id) or
+            (user_type == "notary" and user_id == chat.notary_id) or
+            (user_type == "buyer" and user_id != chat.agent_id)):
+        # Participants are served from the chat's unread counters
+        return get_user_unread_total(chat, user_id)
+
+    scan = _UNREAD_SCANNERS.get(user_type)
+    return scan(chat, user_id) if scan else 0
 
 
 def mark_messages_as_read(chat: PropertyChat, user_id: str, user_type: str,
@@ -278,42 +378,41 @@ def mark_messages_as_read(chat: PropertyChat, user_id: str, user_type: str,
             if msg.sender_id != user_id:
                 msg.is_read = True
 
+    refresh_unread_counts(chat)
     return chat
 
 
-def get_chat_notifications(user_id: str, user_type: str) -> List[Dict[str, any]]:
-    """Get chat notifications for a user (both regular and buying chats)"""
-    notifications = []
-
-    # Get regular property chat notifications
-    regular_chats = get_all_chats_for_user(user_id, user_type)
-    for property_id, chat in regular_chats.items():
-        unread_count = get_unread_messages_count(chat, user_id, user_type)
-        if unread_count > 0:
-            notifications.append({
-                "type": "property",
-                "id": property_id,
-                "unread_count": unread_count,
-                "last_activity": chat.last_activity
-            })
-
-    # Get buying chat notifications
-    buying_chats = get_user_buying_chats(user_id, user_type)
-    for chat_id, chat in buying_chats.items():
-        unread_count = get_unread_messages_count(chat, user_id, user_type)
-        if unread_count > 0:
-            notifications.append({
-                "type": "buying",
-                "id": chat_id,
-                "property_id": chat.property_id,
-                "unread_count": unread_count,
-                "last_activity": chat.last_activity
-            })
-
-    # Sort by most recent activity
-    notifications.sort(key=lambda x: x["last_activity"], reverse=True)
-
-    return notifications
+def get_chat_notifications(user_id: str, user_type: str, limit: Optional[int] = 20) -> List[Dict[str, any]]:
+    """Get the most recent chat notifications for a user (both regular and buying chats)"""
+
+    def iter_notifications():
+        # Regular property chat notifications
+        for property_id, chat in get_all_chats_for_user(user_id, user_type).items():
+            unread_count = get_unread_messages_count(chat, user_id, user_type)
+            if unread_count > 0:
+                yield {
+                    "type": "property",
+                    "id": property_id,
+                    "unread_count": unread_count,
+                    "last_activity": chat.last_activity
+                }
+
+        # Buying chat notifications
+        for chat_id, chat in get_user_buying_chats(user_id, user_type).items():
+            unread_count = get_unread_messages_count(chat, user_id, user_type)
+            if unread_count > 0:
+                yield {
+                    "type": "buying",
+                    "id": chat_id,
+                    "property_id": chat.property_id,
+                    "unread_count": unread_count,
+                    "last_activity": chat.last_activity
+                }
+
+    # Most recent activity first; only the top `limit` are kept (None returns all)
+    if limit is None:
+        return sorted(iter_notifications(), key=lambda x: x["last_activity"], reverse=True)
+    return heapq.nlargest(limit, iter_notifications(), key=lambda x: x["last_activity"])
 
 
 def get_active_buying_chats(user_id: str, user_type: str) -> List[Dict[str, any]]:
@@ -321,14 +420,15 @@ def get_active_buying_chats(user_id: str, user_type: str) -> List[Dict[str, any]
     buying_chats = get_user_buying_chats(user_id, user_type)
     active_chats = []
 
+    transactions = get_all_buying_transactions()
+
     for chat_id, chat in buying_chats.items():
         # Extract transaction ID from chat ID
         transaction_id = chat_id.replace("buying_", "") if chat_id.startswith("buying_") else None
 
         if transaction_id:
             try:
-                from gpp.interface.utils.buying_database import load_buying_transaction
-                transaction = load_buying_transaction(transaction_id)
+                transaction = transactions.get(transaction_id)
 
                 if transaction and transaction.status not in ["completed", "cancelled"]:
                     unread_count = get_unread_messages_count(chat, user_id, user_type)
@@ -363,26 +463,29 @@ def cleanup_old_chats(days_old: int = 30) -> int:
     deleted_count = 0
     cutoff_date = datetime.now() - timedelta(days=days_old)
 
-    # Clean up buying chats
-    all_buying_chats = get_all_buying_chats()
+    # Clean up buying chats, rewriting the chat file once at the end
+    data = load_buying_chat_data()
+    transactions = get_all_buying_transactions()
 
-    for chat_id, chat in all_buying_chats.items():
+    for chat_id in list(data):
         if chat_id.startswith("buying_"):
             transaction_id = chat_id[7:]  # Remove "buying_" prefix
 
             try:
-                from gpp.interface.utils.buying_database import load_buying_transaction
-                transaction = load_buying_transaction(transaction_id)
+                transaction = transactions.get(transaction_id)
 
                 if (transaction and
                     transaction.status in ["completed", "cancelled"] and
                     transaction.last_updated < cutoff_date):
 
-                    if delete_buying_chat(chat_id):
-                        deleted_count += 1
+                    del data[chat_id]
+                    deleted_count += 1
             except Exception:
                 pass
 
+    if deleted_count:
+        save_buying_chat_data(data)
+
     return deleted_count
 
 
@@ -390,22 +493,23 @@ def search_chat_messages(chat: PropertyChat, search_term: str, user_id: str,
                         user_type: str) -> List[ChatMessage]:
     """Search for messages containing a term"""
     matching_messages = []
+    needle = search_term.lower()
 
     # Search in agent-notary messages
     if user_type in ["agent", "notary"]:
         for msg in chat.agent_notary_messages:
-            if search_term.lower() in msg.message.lower():
+            if needle in msg.message.lower():
                 matching_messages.append(msg)
 
     # Search in buyer-agent messages
     if user_type == "buyer" and user_id in chat.buyer_agent_chats:
         for msg in chat.buyer_agent_chats[user_id]:
-            if search_term.lower() in msg.message.lower():
+            if needle in msg.message.lower():
                 matching_messages.append(msg)
     elif user_type == "agent":
         for buyer_id, messages in chat.buyer_agent_chats.items():
             for msg in messages:
-                if search_term.lower() in msg.message.lower():
+                if needle in msg.message.lower():
                     matching_messages.append(msg)
 
     # Sort by timestamp
@@ -428,25 +532,18 @@ def get_chat_statistics(chat: PropertyChat) -> Dict[str, any]:
     }
 
     # Count buyer-agent messages
-    for buyer_id, messages in chat.buyer_agent_chats.items():
-        stats["buyer_agent_messages"] += len(messages)
-
-        # Count messages by user
-        for msg in messages:
-            if msg.sender_id not in stats["message_count_by_user"]:
-                stats["message_count_by_user"][msg.sender_id] = 0
-            stats["message_count_by_user"][msg.sender_id] += 1
+    stats["buyer_agent_messages"] = sum(map(len, chat.buyer_agent_chats.values()))
 
-    # Count agent-notary messages by user
-    for msg in chat.agent_notary_messages:
-        if msg.sender_id not in stats["message_count_by_user"]:
-            stats["message_count_by_user"][msg.sender_id] = 0
-        stats["message_count_by_user"][msg.sender_id] += 1
+    # Count messages by user (buyer-agent chats first, then agent-notary)
+    counter = Counter()
+    for messages in chat.buyer_agent_chats.values():
+        counter.update(msg.sender_id for msg in messages)
+    counter.update(msg.sender_id for msg in chat.agent_notary_messages)
+    stats["message_count_by_user"] = dict(counter)
 
     # Find most active participant
-    if stats["message_count_by_user"]:
-        most_active = max(stats["message_count_by_user"].items(), key=lambda x: x[1])
-        stats["most_active_participant"] = most_active[0]
+    if counter:
+        stats["most_active_participant"] = counter.most_common(1)[0][0]
 
     stats["total_messages"] = stats["agent_notary_messages"] + stats["buyer_agent_messages"]
 
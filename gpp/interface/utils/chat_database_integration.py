@@ -3,22 +3,32 @@ Chat Database Integration for Buying Transactions
 Extends existing chat_database.py with buying transaction chat functionality
 """
 
-import json
+import itertools
 import os
+from collections import Counter
 from typing import Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
+import streamlit as st
 
-from gpp.classes.chat import PropertyChat, ChatMessage
-from gpp.interface.utils.database import load_data, save_data
+from gpp.classes.chat import PropertyChat, ChatMessage, get_user_unread_total, refresh_unread_counts
+from gpp.interface.utils.database import encode_json, load_data, save_data
 
 # File paths
 BUYING_CHATS_FILE = "data/buying_chats.json"
 
 
+_initialized = False
+
+
 def init_buying_chat_database():
-    """Initialize buying chat database file"""
+    """Initialize buying chat database file (once per process)"""
+    global _initialized
+    if _initialized:
+        return
+
     if not os.path.exists(BUYING_CHATS_FILE):
         save_data(BUYING_CHATS_FILE, {})
+    _initialized = True
 
 
 def save_buying_chat(chat: PropertyChat):
@@ -28,23 +38,8 @@ def save_buying_chat(chat: PropertyChat):
     # Load existing chats
     chats = load_data(BUYING_CHATS_FILE)
 
-    # Convert to dict and handle datetime serialization
-    chat_dict = chat.dict()
-
-    # Convert datetime objects to ISO strings
-    def convert_datetime(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: convert_datetime(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_datetime(item) for item in obj]
-        return obj
-
-    chat_dict = convert_datetime(chat_dict)
-
-    # Save chat
-    chats[chat.chat_id] = chat_dict
+    # encode_json writes datetimes as ISO strings itself
+    chats[chat.chat_id] = chat.dict()
     save_data(BUYING_CHATS_FILE, chats)
 
 
@@ -57,27 +52,8 @@ def load_buying_chat(chat_id: str) -> Optional[PropertyChat]:
     if chat_id not in chats:
         return None
 
-    chat_dict = chats[chat_id]
-
-    # Convert ISO strings back to datetime objects
-    def convert_from_json(obj):
-        if isinstance(obj, str):
-            # Try to parse as datetime
-            for fmt in ["%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"]:
-                try:
-                    return datetime.strptime(obj, fmt)
-                except ValueError:
-                    continue
-            return obj
-        elif isinstance(obj, dict):
-            return {k: convert_from_json(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_from_json(item) for item in obj]
-        return obj
-
-    chat_dict = convert_from_json(chat_dict)
-
-    return PropertyChat(**chat_dict)
+    # The model parses the ISO timestamp strings into its datetime fields
+    return PropertyChat(**chats[chat_id])
 
 
 def get_or_create_buying_transaction_chat(transaction_id: str) -> PropertyChat:
@@ -114,17 +90,29 @@ def get_or_create_buying_transaction_chat(transaction_id: str) -> PropertyChat:
     return chat
 
 
+def _buying_chats_version() -> int:
+    """Modification time of the buying chats file, used as the cache key"""
+    try:
+        return os.stat(BUYING_CHATS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
 def get_all_buying_chats() -> Dict[str, PropertyChat]:
     """Get all buying transaction chats"""
     init_buying_chat_database()
 
+    return _load_all_buying_chats(_buying_chats_version())
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _load_all_buying_chats(file_version: int) -> Dict[str, PropertyChat]:
+    """Build every buying chat once per modification time"""
     chats_dict = load_data(BUYING_CHATS_FILE)
     chats = {}
 
     for chat_id, chat_data in chats_dict.items():
-        chat = load_buying_chat(chat_id)
-        if chat:
-            chats[chat_id] = chat
+        chats[chat_id] = PropertyChat(**chat_data)
 
     return chats
 
@@ -147,6 +135,12 @@ def get_user_buying_chats(user_id: str, user_type: str) -> Dict[str, PropertyCha
 
 def get_unread_messages_count(chat: PropertyChat, user_id: str, user_type: str) -> int:
     """Get count of unread messages for a user in a chat"""
+    if ((user_type == "agent" and user_id == chat.agent_id) or
+            (user_type == "notary" and user_id == chat.notary_id) or
+            (user_type == "buyer" and user_id != chat.agent_id)):
+        # Participants are served from the chat's unread counters
+        return get_user_unread_total(chat, user_id)
+
     unread_count = 0
 
     if user_type in ["agent", "notary"]:
@@ -171,21 +165,29 @@ def get_unread_messages_count(chat: PropertyChat, user_id: str, user_type: str)
     return unread_count
 
 
-def mark_messages_as_read_in_chat(chat: PropertyChat, user_id: str, user_type: str,
-                                  buyer_id: str = None) -> PropertyChat:
-    """Mark messages as read for a user in a chat"""
+def _channels_to_mark(chat: PropertyChat, user_type: str, buyer_id: str = None) -> List[List[ChatMessage]]:
+    """Message lists that mark_messages_as_read_in_chat updates for these arguments"""
+    channels = []
     if user_type in ["agent", "notary"] and not buyer_id:
-        # Mark agent-notary messages as read
-        for msg in chat.agent_notary_messages:
-            if msg.sender_id != user_id:
-                msg.is_read = True
+        # Agent-notary messages
+        channels.append(chat.agent_notary_messages)
 
     if buyer_id and buyer_id in chat.buyer_agent_chats:
-        # Mark buyer-agent messages as read
-        for msg in chat.buyer_agent_chats[buyer_id]:
+        # Buyer-agent messages
+        channels.append(chat.buyer_agent_chats[buyer_id])
+
+    return channels
+
+
+def mark_messages_as_read_in_chat(chat: PropertyChat, user_id: str, user_type: str,
+                                  buyer_id: str = None) -> PropertyChat:
+    """Mark messages as read for a user in a chat"""
+    for messages in _channels_to_mark(chat, user_type, buyer_id):
+        for msg in messages:
             if msg.sender_id != user_id:
                 msg.is_read = True
 
+    refresh_unread_counts(chat)
     return chat
 
 
@@ -207,22 +209,23 @@ def search_chat_messages(chat: PropertyChat, search_term: str, user_id: str,
                          user_type: str) -> List[ChatMessage]:
     """Search for messages containing a term"""
     matching_messages = []
+    needle = search_term.lower()
 
     # Search in agent-notary messages
     if user_type in ["agent", "notary"]:
         for msg in chat.agent_notary_messages:
-            if search_term.lower() in msg.message.lower():
+            if needle in msg.message.lower():
                 matching_messages.append(msg)
 
     # Search in buyer-agent messages
     if user_type == "buyer" and user_id in chat.buyer_agent_chats:
         for msg in chat.buyer_agent_chats[user_id]:
-            if search_term.lower() in msg.message.lower():
+            if needle in msg.message.lower():
                 matching_messages.append(msg)
     elif user_type == "agent":
         for buyer_id, messages in chat.buyer_agent_chats.items():
             for msg in messages:
-                if search_term.lower() in msg.message.lower():
+                if needle in msg.message.lower():
                     matching_messages.append(msg)
 
     # Sort by timestamp
@@ -245,25 +248,18 @@ def get_chat_statistics(chat: PropertyChat) -> Dict[str, any]:
     }
 
     # Count buyer-agent messages
-    for buyer_id, messages in chat.buyer_agent_chats.items():
-        stats["buyer_agent_messages"] += len(messages)
-
-        # Count messages by user
-        for msg in messages:
-            if msg.sender_id not in stats["message_count_by_user"]:
-                stats["message_count_by_user"][msg.sender_id] = 0
-            stats["message_count_by_user"][msg.sender_id] += 1
+    stats["buyer_agent_messages"] = sum(map(len, chat.buyer_agent_chats.values()))
 
-    # Count agent-notary messages by user
-    for msg in chat.agent_notary_messages:
-        if msg.sender_id not in stats["message_count_by_user"]:
-            stats["message_count_by_user"][msg.sender_id] = 0
-        stats["message_count_by_user"][msg.sender_id] += 1
+    # Count messages by user (buyer-agent chats first, then agent-notary)
+    counter = Counter()
+    for messages in chat.buyer_agent_chats.values():
+        counter.update(msg.sender_id for msg in messages)
+    counter.update(msg.sender_id for msg in chat.agent_notary_messages)
+    stats["message_count_by_user"] = dict(counter)
 
     # Find most active participant
-    if stats["message_count_by_user"]:
-        most_active = max(stats["message_count_by_user"].items(), key=lambda x: x[1])
-        stats["most_active_participant"] = most_active[0]
+    if counter:
+        stats["most_active_participant"] = counter.most_common(1)[0][0]
 
     stats["total_messages"] = stats["agent_notary_messages"] + stats["buyer_agent_messages"]
 
@@ -273,32 +269,34 @@ def get_chat_statistics(chat: PropertyChat) -> Dict[str, any]:
 def export_chat_history(chat: PropertyChat, format: str = "json") -> str:
     """Export chat history in specified format"""
     if format == "json":
-        return json.dumps(chat.dict(), indent=2, default=str)
+        return encode_json(chat.dict()).decode('utf-8')
 
     elif format == "text":
-        output = f"Chat History - {chat.chat_id}\n"
-        output += f"Property: {chat.property_id}\n"
-        output += f"Created: {chat.created_date}\n"
-        output += "=" * 50 + "\n\n"
+        parts = [
+            f"Chat History - {chat.chat_id}\n",
+            f"Property: {chat.property_id}\n",
+            f"Created: {chat.created_date}\n",
+            "=" * 50 + "\n\n",
+        ]
 
         # Agent-Notary Messages
         if chat.agent_notary_messages:
-            output += "AGENT-NOTARY CONVERSATION\n"
-            output += "-" * 30 + "\n"
+            parts.append("AGENT-NOTARY CONVERSATION\n")
+            parts.append("-" * 30 + "\n")
             for msg in chat.agent_notary_messages:
-                output += f"[{msg.timestamp}] {msg.sender_name or msg.sender_type}: {msg.message}\n"
-            output += "\n"
+                parts.append(f"[{msg.timestamp}] {msg.sender_name or msg.sender_type}: {msg.message}\n")
+            parts.append("\n")
 
         # Buyer-Agent Messages
         for buyer_id, messages in chat.buyer_agent_chats.items():
             if messages:
-                output += f"BUYER-AGENT CONVERSATION (Buyer: {buyer_id[:8]}...)\n"
-                output += "-" * 30 + "\n"
+                parts.append(f"BUYER-AGENT CONVERSATION (Buyer: {buyer_id[:8]}...)\n")
+                parts.append("-" * 30 + "\n")
                 for msg in messages:
-                    output += f"[{msg.timestamp}] {msg.sender_name or msg.sender_type}: {msg.message}\n"
-                output += "\n"
+                    parts.append(f"[{msg.timestamp}] {msg.sender_name or msg.sender_type}: {msg.message}\n")
+                parts.append("\n")
 
-        return output
+        return "".join(parts)
 
     else:
         raise ValueError("Unsupported export format. Use 'json' or 'text'")
@@ -308,13 +306,13 @@ def cleanup_old_chats(days_old: int = 30) -> int:
     """Clean up chats older than specified days for completed transactions"""
     from gpp.interface.utils.buying_database import get_all_buying_transactions
 
-    all_chats = get_all_buying_chats()
+    chats = load_data(BUYING_CHATS_FILE)
     all_transactions = get_all_buying_transactions()
 
-    deleted_count = 0
     cutoff_date = datetime.now() - timedelta(days=days_old)
+    to_delete = []
 
-    for chat_id, chat in all_chats.items():
+    for chat_id in chats:
         # Extract transaction ID from chat ID
         if chat_id.startswith("buying_"):
             transaction_id = chat_id[7:]  # Remove "buying_" prefix
@@ -324,10 +322,15 @@ def cleanup_old_chats(days_old: int = 30) -> int:
                 transaction = all_transactions[transaction_id]
                 if (transaction.status in ["completed", "cancelled"] and
                         transaction.last_updated < cutoff_date):
+                    to_delete.append(chat_id)
 
-                    if delete_buying_chat(chat_id):
-                        deleted_count += 1
+    # Rewrite the chats file once for all deletions
+    if to_delete:
+        for chat_id in to_delete:
+            del chats[chat_id]
+        save_data(BUYING_CHATS_FILE, chats)
 
+    deleted_count = len(to_delete)
     return deleted_count
 
 
@@ -370,23 +373,20 @@ def integrate_with_existing_chat_system():
 # Additional utility functions for the UI
 def get_chat_preview(chat: PropertyChat, user_id: str, user_type: str) -> Dict[str, any]:
     """Get a preview of the chat for display in lists"""
-    last_message = None
     unread_count = get_unread_messages_count(chat, user_id, user_type)
 
-    # Get the most recent message
-    all_messages = []
+    # Get the most recent message, without copying the message lists
+    channels = []
 
     if user_type in ["agent", "notary"]:
-        all_messages.extend(chat.agent_notary_messages)
+        channels.append(chat.agent_notary_messages)
 
     if user_type == "buyer" and user_id in chat.buyer_agent_chats:
-        all_messages.extend(chat.buyer_agent_chats[user_id])
+        channels.append(chat.buyer_agent_chats[user_id])
     elif user_type == "agent":
-        for messages in chat.buyer_agent_chats.values():
-            all_messages.extend(messages)
+        channels.extend(chat.buyer_agent_chats.values())
 
-    if all_messages:
-        last_message = max(all_messages, key=lambda x: x.timestamp)
+    last_message = max(itertools.chain.from_iterable(channels), key=lambda x: x.timestamp, default=None)
 
     return {
         "chat_id": chat.chat_id,
@@ -427,11 +427,13 @@ def get_chat_notifications(user_id: str, user_type: str) -> List[Dict[str, any]]
                         recent_unread = msg
                         break
             elif user_type == "agent":
+                # Messages are appended in time order, so the first unread from the end is each buyer's latest
                 for messages in chat.buyer_agent_chats.values():
                     for msg in reversed(messages):
                         if msg.sender_id != user_id and not msg.is_read:
                             if not recent_unread or msg.timestamp > recent_unread.timestamp:
                                 recent_unread = msg
+                            break
 
             if recent_unread:
                 notifications.append({
@@ -458,14 +460,28 @@ def bulk_mark_as_read(user_id: str, user_type: str, chat_ids: List[str] = None):
         user_chats = get_user_buying_chats(user_id, user_type)
         chat_ids = list(user_chats.keys())
 
+    # Load the chats file once and write it back once for all chats
+    chats = load_data(BUYING_CHATS_FILE)
+    updated = False
+
     for chat_id in chat_ids:
-        chat = load_buying_chat(chat_id)
-        if chat:
-            if user_type == "buyer":
-                chat = mark_messages_as_read_in_chat(chat, user_id, user_type, user_id)
-            else:
-                chat = mark_messages_as_read_in_chat(chat, user_id, user_type)
-            save_buying_chat(chat)
+        if chat_id not in chats:
+            continue
+
+        chat = PropertyChat(**chats[chat_id])
+        buyer_id = user_id if user_type == "buyer" else None
+
+        # Nothing to flip means nothing to write for this chat
+        if not any(msg.sender_id != user_id and not msg.is_read
+                   for messages in _channels_to_mark(chat, user_type, buyer_id) for msg in messages):
+            continue
+
+        chat = mark_messages_as_read_in_chat(chat, user_id, user_type, buyer_id)
+        chats[chat_id] = chat.dict()
+        updated = True
+
+    if updated:
+        save_data(BUYING_CHATS_FILE, chats)
 
 
 # Database maintenance functions
@@ -477,6 +493,9 @@ def validate_chat_integrity():
     from gpp.interface.utils.buying_database import get_all_buying_transactions
     all_transactions = get_all_buying_transactions()
 
+    from gpp.interface.utils.database import get_properties
+    properties = get_properties()
+
     for chat_id, chat in all_chats.items():
         # Check if buying chat has corresponding transaction
         if chat_id.startswith("buying_"):
@@ -485,8 +504,6 @@ def validate_chat_integrity():
                 issues.append(f"Chat {chat_id} has no corresponding transaction")
 
         # Check if property_id exists
-        from gpp.interface.utils.database import get_properties
-        properties = get_properties()
         if chat.property_id not in properties:
             issues.append(f"Chat {chat_id} references non-existent property {chat.property_id}")
 
@@ -505,7 +522,7 @@ def validate_chat_integrity():
 
 def repair_chat_database():
     """Repair common chat database issues"""
-    repaired_count = 0
+    repaired_chats = []
     all_chats = get_all_buying_chats()
 
     for chat_id, chat in all_chats.items():
@@ -535,9 +552,16 @@ def repair_chat_database():
             modified = True
 
         if modified:
-            save_buying_chat(chat)
-            repaired_count += 1
+            repaired_chats.append(chat)
+
+    # Rewrite the chats file once for all repaired chats
+    if repaired_chats:
+        chats = load_data(BUYING_CHATS_FILE)
+        for chat in repaired_chats:
+            chats[chat.chat_id] = chat.dict()
+        save_data(BUYING_CHATS_FILE, chats)
 
+    repaired_count = len(repaired_chats)
     return repaired_count
 
 
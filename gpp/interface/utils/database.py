@@ -4,13 +4,20 @@ Database operations and data management utilities
 
 import json
 import os
+import threading
 import streamlit as st
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from datetime import datetime
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, List, Optional
 
 from gpp.interface.config.constants import (
     DATA_DIR, PROPERTIES_FILE, DOCUMENTS_FILE, AGENTS_FILE,
-    BUYERS_FILE, NOTARIES_FILE, BUYING_FILE
+    BUYERS_FILE, BUYERS_DIR, NOTARIES_FILE, BUYING_FILE
 )
 from gpp.classes.property import Property
 from gpp.classes.document import Document
@@ -18,10 +25,14 @@ from gpp.classes.agent import Agent
 from gpp.classes.buyer import Buyer
 from gpp.classes.notary import Notary
 
+# Read/write buffer for the JSON stores (the 8 KiB default means many syscalls on larger files)
+IO_BUFFER_SIZE = 256 * 1024
+
 
 def init_data_files():
     """Initialize data files if they don't exist"""
     os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(BUYERS_DIR, exist_ok=True)
 
     files = [PROPERTIES_FILE, DOCUMENTS_FILE, AGENTS_FILE, BUYERS_FILE, NOTARIES_FILE, BUYING_FILE]
     for file_path in files:
@@ -29,23 +40,84 @@ def init_data_files():
             with open(file_path, 'w') as f:
                 json.dump({}, f)
 
+    _migrate_legacy_buyers()
+
+
+def _migrate_legacy_buyers():
+    """Move records from the legacy buyers file into per-buyer files, then empty it"""
+    legacy = load_data(BUYERS_FILE)
+    if not legacy:
+        return
+
+    for buyer_id, buyer_data in legacy.items():
+        buyer_path = os.path.join(BUYERS_DIR, f"{buyer_id}.json")
+        # A per-buyer file is newer than the legacy record, so it is kept
+        if not os.path.exists(buyer_path):
+            atomic_write(buyer_path, encode_json(buyer_data))
+
+    # Emptied only after every record has its own file, so an interrupted run just repeats
+    save_data(BUYERS_FILE, {})
+
+
+def decode_json(raw: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_default(obj):
+    """Fallback serializer: ISO datetimes (as orjson writes them natively), str for anything else"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def encode_json(data, indent: bool = True) -> bytes:
+    """Serialize data to JSON bytes (indented unless indent=False), using orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(data, indent=2 if indent else None, default=_json_default).encode('utf-8')
+
 
 def load_data(file_path: str) -> dict:
     """Load data from JSON file"""
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        with open(file_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+            return decode_json(f.read())
     except:
         return {}
 
 
+def atomic_write(file_path: str, payload: bytes):
+    """Write bytes to a temporary file and swap it into place, so readers never see a partial file"""
+    # Unique per process and thread, in the same directory so os.replace stays a rename
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def save_data(file_path: str, data: dict):
     """Save data to JSON file"""
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    atomic_write(file_path, encode_json(data))
+
+    # Cached loaders read these files; drop them so the next rerun sees this write
+    st.cache_data.clear()
 
 
 # Property operations
+@st.cache_data(ttl=30, show_spinner=False)
 def get_properties() -> Dict[str, Property]:
     """Get all properties from database"""
     data = load_data(PROPERTIES_FILE)
@@ -61,6 +133,39 @@ def get_properties() -> Dict[str, Property]:
     return properties
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_property_index() -> Dict[str, Dict[str, List[str]]]:
+    """Map each agent and each attached notary to the IDs of their properties, in store order"""
+    by_agent = {}
+    by_notary = {}
+    for prop_id, prop_data in get_properties().items():
+        by_agent.setdefault(prop_data.agent_id, []).append(prop_id)
+
+        # A notary can be both the attached notary and listed in attached_notarys_id
+        notary_ids = set(prop_data.attached_notarys_id)
+        if prop_data.notary_attached:
+            notary_ids.add(prop_data.notary_attached)
+        for notary_id in notary_ids:
+            by_notary.setdefault(notary_id, []).append(prop_id)
+    return {"agent": by_agent, "notary": by_notary}
+
+
+def get_property_ids_by_agent(agent_id: str) -> List[str]:
+    """IDs of the properties managed by an agent, without scanning every property"""
+    return _get_property_index()["agent"].get(agent_id, [])
+
+
+def get_property_ids_by_notary(notary_id: str) -> List[str]:
+    """IDs of the properties a notary is attached to, without scanning every property"""
+    return _get_property_index()["notary"].get(notary_id, [])
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_property(property_id: str) -> Optional[Property]:
+    """Get a single property, cached per ID so repeat lookups only copy that property"""
+    return get_properties().get(property_id)
+
+
 def save_property(property_obj: Property):
     """Save property to database"""
     properties = load_data(PROPERTIES_FILE)
@@ -69,6 +174,7 @@ def save_property(property_obj: Property):
 
 
 # Document operations
+@st.cache_data(ttl=30, show_spinner=False)
 def get_documents() -> Dict[str, Document]:
     """Get all documents from database"""
     data = load_data(DOCUMENTS_FILE)
@@ -89,6 +195,7 @@ def save_document(document_obj: Document):
 
 
 # Agent operations
+@st.cache_data(ttl=30, show_spinner=False)
 def get_agents() -> Dict[str, Agent]:
     """Get all agents from database"""
     data = load_data(AGENTS_FILE)
@@ -109,9 +216,18 @@ def save_agent(agent_obj: Agent):
 
 
 # Buyer operations
+@st.cache_data(ttl=30, show_spinner=False)
 def get_buyers() -> Dict[str, Buyer]:
-    """Get all buyers from database"""
+    """Get all buyers from database (per-buyer files take precedence over the legacy buyers file)"""
+    # The legacy file is emptied by init_data_files; it is still read in case it was not run yet
     data = load_data(BUYERS_FILE)
+    if os.path.isdir(BUYERS_DIR):
+        with os.scandir(BUYERS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    buyer_data = load_data(entry.path)
+                    if buyer_data:
+                        data[entry.name[:-len('.json')]] = buyer_data
     buyers = {}
     for buyer_id, buyer_data in data.items():
         try:
@@ -122,10 +238,8 @@ def get_buyers() -> Dict[str, Buyer]:
 
 
 def save_buyer(buyer_obj: Buyer):
-    """Save buyer to database"""
-    buyers = load_data(BUYERS_FILE)
-    buyers[buyer_obj.buyer_id] = buyer_obj.dict()
-    save_data(BUYERS_FILE, buyers)
+    """Save buyer to its own file, so the write does not depend on the number of buyers"""
+    save_data(os.path.join(BUYERS_DIR, f"{buyer_obj.buyer_id}.json"), buyer_obj.dict())
 
 
 # Notary operations
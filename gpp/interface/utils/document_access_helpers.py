@@ -4,18 +4,27 @@ Provides utilities for managing document visibility and access based on user rol
 Integrates with existing constants and file structure
 """
 
-from typing import Dict, List, Optional, Tuple
+import itertools
+import streamlit as st
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from gpp.classes.document import Document
 from gpp.classes.property import Property
 from gpp.classes.buying import Buying
-from gpp.interface.utils.database import get_documents, get_properties
-from gpp.interface.utils.buying_database import get_user_buying_transactions
+from gpp.interface.utils.database import (
+    get_documents, get_properties, get_property_ids_by_agent, get_property_ids_by_notary
+)
+from gpp.interface.utils.buying_database import get_buying_id_for, get_user_buying_transactions
 from gpp.interface.config.constants import MANDATORY_DOCS, ADDITIONAL_DOC_CATEGORIES, BUYING_DOCUMENT_TYPES
 
 
-def can_user_access_property_documents(user_id: str, user_type: str, property_id: str) -> Tuple[bool, str]:
+def can_user_access_property_documents(user_id: str, user_type: str, property_id: str,
+                                       properties: Dict[str, Property] = None,
+                                       buying_transactions: Dict[str, Buying] = None) -> Tuple[bool, str]:
     """
     Check if a user can access property documents based on their role and transaction status
+    Pass properties (and a buyer's buying_transactions) when the caller already loaded them,
+    to avoid fetching the stores again
 
     Returns:
         Tuple[bool, str]: (can_access, reason)
@@ -23,7 +32,8 @@ def can_user_access_property_documents(user_id: str, user_type: str, property_id
 
     if user_type == "agent":
         # Agents can access documents for their own properties
-        properties = get_properties()
+        if properties is None:
+            properties = get_properties()
         property_data = properties.get(property_id)
         if property_data and property_data.agent_id == user_id:
             return True, "Agent owns this property"
@@ -31,32 +41,56 @@ def can_user_access_property_documents(user_id: str, user_type: str, property_id
 
     elif user_type == "notary":
         # Notaries can access documents for properties they're assigned to validate
-        properties = get_properties()
+        if properties is None:
+            properties = get_properties()
         property_data = properties.get(property_id)
         if property_data and (property_data.notary_attached == user_id or user_id in property_data.attached_notarys_id):
             return True, "Notary assigned to this property"
         # Also allow access if there are active buying transactions needing validation
-        buying_transactions = get_user_buying_transactions(user_id, "notary")
-        for transaction in buying_transactions.values():
-            if transaction.property_id == property_id and transaction.status in ["documents_pending", "under_review"]:
-                return True, "Active transaction requiring validation"
+        if get_buying_id_for(user_id, "notary", property_id):
+            return True, "Active transaction requiring validation"
         return False, "Not assigned to this property"
 
     elif user_type == "buyer":
         # Buyers can access documents for properties they have reserved/purchased
-        buying_transactions = get_user_buying_transactions(user_id, "buyer")
-        for transaction in buying_transactions.values():
-            if transaction.property_id == property_id:
-                return True, f"Active transaction ({transaction.status})"
+        transaction_id = get_buying_id_for(user_id, "buyer", property_id)
+        if transaction_id:
+            if buying_transactions is None:
+                buying_transactions = get_user_buying_transactions(user_id, "buyer")
+            transaction = buying_transactions[transaction_id]
+            return True, f"Active transaction ({transaction.status})"
         return False, "No active transaction for this property"
 
     return False, "Invalid user type"
 
 
-def get_accessible_documents_for_user(user_id: str, user_type: str, property_id: str = None) -> Dict[
-    str, List[Document]]:
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_accessible_property_ids(user_id: str, user_type: str) -> List[str]:
+    """IDs of the properties whose documents a user can access (same rules as can_user_access_property_documents)"""
+    if user_type == "agent":
+        return list(get_property_ids_by_agent(user_id))
+
+    if user_type == "notary":
+        # Assigned properties first, then properties with transactions awaiting validation
+        property_ids = dict.fromkeys(get_property_ids_by_notary(user_id))
+        for transaction in get_user_buying_transactions(user_id, "notary").values():
+            property_ids[transaction.property_id] = None
+        return list(property_ids)
+
+    if user_type == "buyer":
+        return list(dict.fromkeys(
+            transaction.property_id for transaction in get_user_buying_transactions(user_id, "buyer").values()
+        ))
+
+    return []
+
+
+def get_accessible_documents_for_user(user_id: str, user_type: str, property_id: str = None,
+                                      properties: Dict[str, Property] = None,
+                                      documents: Dict[str, Document] = None) -> Dict[str, List[Document]]:
     """
     Get all documents accessible to a user, optionally filtered by property
+    Pass properties/documents when the caller already loaded them, to avoid fetching the stores again
 
     Returns:
         Dict with categories: 'mandatory_docs', 'additional_docs', 'transaction_docs'
@@ -67,12 +101,27 @@ def get_accessible_documents_for_user(user_id: str, user_type: str, property_id:
         'transaction_docs': []
     }
 
-    documents = get_documents()
-    properties = get_properties()
+    if documents is None:
+        documents = get_documents()
+    if properties is None:
+        properties = get_properties()
+
+    # Each category lists a document once, even when several properties or transactions reference it
+    seen = {category: set() for category in accessible_docs}
+
+    def collect(category: str, doc_id: Optional[str]):
+        if doc_id and doc_id not in seen[category]:
+            document = documents.get(doc_id)
+            if document is not None:
+                seen[category].add(doc_id)
+                accessible_docs[category].append(document)
 
     if property_id:
-        # Check access for specific property
-        can_access, reason = can_user_access_property_documents(user_id, user_type, property_id)
+        # Check access for specific property (a buyer's transactions are loaded once for both steps)
+        buying_transactions = get_user_buying_transactions(user_id, "buyer") if user_type == "buyer" else None
+        can_access, reason = can_user_access_property_documents(
+            user_id, user_type, property_id, properties, buying_transactions
+        )
         if not can_access:
             return accessible_docs
 
@@ -82,23 +131,19 @@ def get_accessible_documents_for_user(user_id: str, user_type: str, property_id:
 
         # Get mandatory documents
         for doc_id in property_data.mandatory_legal_docs.values():
-            if doc_id and doc_id in documents:
-                accessible_docs['mandatory_docs'].append(documents[doc_id])
+            collect('mandatory_docs', doc_id)
 
         # Get additional documents
-        for doc_list in property_data.additional_docs.values():
-            for doc_id in doc_list:
-                if doc_id in documents:
-                    accessible_docs['additional_docs'].append(documents[doc_id])
+        for doc_id in itertools.chain.from_iterable(property_data.additional_docs.values()):
+            collect('additional_docs', doc_id)
 
-        # Get transaction documents if buyer
+        # Get transaction documents if buyer (one transaction per buyer and property)
         if user_type == "buyer":
-            buying_transactions = get_user_buying_transactions(user_id, "buyer")
             for transaction in buying_transactions.values():
                 if transaction.property_id == property_id:
                     for doc_id in transaction.buying_documents.values():
-                        if doc_id and doc_id in documents:
-                            accessible_docs['transaction_docs'].append(documents[doc_id])
+                        collect('transaction_docs', doc_id)
+                    break
 
     else:
         # Get all accessible documents for user
@@ -109,91 +154,67 @@ def get_accessible_documents_for_user(user_id: str, user_type: str, property_id:
                 if property_data:
                     # Mandatory docs
                     for doc_id in property_data.mandatory_legal_docs.values():
-                        if doc_id and doc_id in documents:
-                            accessible_docs['mandatory_docs'].append(documents[doc_id])
+                        collect('mandatory_docs', doc_id)
 
                     # Additional docs
-                    for doc_list in property_data.additional_docs.values():
-                        for doc_id in doc_list:
-                            if doc_id in documents:
-                                accessible_docs['additional_docs'].append(documents[doc_id])
+                    for doc_id in itertools.chain.from_iterable(property_data.additional_docs.values()):
+                        collect('additional_docs', doc_id)
 
                     # Transaction docs
                     for doc_id in transaction.buying_documents.values():
-                        if doc_id and doc_id in documents:
-                            accessible_docs['transaction_docs'].append(documents[doc_id])
-
-        elif user_type == "agent":
-            # Agent can access all documents for their properties
-            for property_id, property_data in properties.items():
-                if property_data.agent_id == user_id:
-                    # Mandatory docs
-                    for doc_id in property_data.mandatory_legal_docs.values():
-                        if doc_id and doc_id in documents:
-                            accessible_docs['mandatory_docs'].append(documents[doc_id])
+                        collect('transaction_docs', doc_id)
 
-                    # Additional docs
-                    for doc_list in property_data.additional_docs.values():
-                        for doc_id in doc_list:
-                            if doc_id in documents:
-                                accessible_docs['additional_docs'].append(documents[doc_id])
-
-        elif user_type == "notary":
-            # Notary can access documents for assigned properties and active transactions
-            buying_transactions = get_user_buying_transactions(user_id, "notary")
-            accessible_property_ids = set()
-
-            # Properties assigned to notary
-            for property_id, property_data in properties.items():
-                if property_data.notary_attached == user_id or user_id in property_data.attached_notarys_id:
-                    accessible_property_ids.add(property_id)
-
-            # Properties with active transactions
-            for transaction in buying_transactions.values():
-                accessible_property_ids.add(transaction.property_id)
-
-            # Get documents for accessible properties
-            for property_id in accessible_property_ids:
+        elif user_type in ("agent", "notary"):
+            # Agents: their own properties; notaries: assigned properties and active transactions
+            for property_id in _get_accessible_property_ids(user_id, user_type):
                 property_data = properties.get(property_id)
                 if property_data:
                     # Mandatory docs
                     for doc_id in property_data.mandatory_legal_docs.values():
-                        if doc_id and doc_id in documents:
-                            accessible_docs['mandatory_docs'].append(documents[doc_id])
+                        collect('mandatory_docs', doc_id)
 
                     # Additional docs
-                    for doc_list in property_data.additional_docs.values():
-                        for doc_id in doc_list:
-                            if doc_id in documents:
-                                accessible_docs['additional_docs'].append(documents[doc_id])
-
-    # Remove duplicates
-    accessible_docs['mandatory_docs'] = list(
-        {doc.document_id: doc for doc in accessible_docs['mandatory_docs']}.values())
-    accessible_docs['additional_docs'] = list(
-        {doc.document_id: doc for doc in accessible_docs['additional_docs']}.values())
-    accessible_docs['transaction_docs'] = list(
-        {doc.document_id: doc for doc in accessible_docs['transaction_docs']}.values())
+                    for doc_id in itertools.chain.from_iterable(property_data.additional_docs.values()):
+                        collect('additional_docs', doc_id)
 
     return accessible_docs
 
 
-def get_property_document_summary(property_id: str, viewer_user_id: str, viewer_user_type: str) -> Dict[str, any]:
+def get_property_document_summary(property_id: str, viewer_user_id: str, viewer_user_type: str,
+                                  properties: Dict[str, Property] = None,
+                                  documents: Dict[str, Document] = None) -> Dict[str, any]:
     """
     Get a summary of all documents for a property from a user's perspective
+    Pass properties/documents when the caller already loaded them, to avoid fetching the stores again
     """
-    can_access, reason = can_user_access_property_documents(viewer_user_id, viewer_user_type, property_id)
+    if properties is None:
+        properties = get_properties()
+
+    can_access, reason = can_user_access_property_documents(viewer_user_id, viewer_user_type, property_id, properties)
 
     if not can_access:
         return {"accessible": False, "reason": reason}
 
-    properties = get_properties()
     property_data = properties.get(property_id)
 
     if not property_data:
         return {"accessible": False, "reason": "Property not found"}
 
-    documents = get_documents()
+    if documents is None:
+        documents = get_documents()
+
+    # Buyers also see the documents of their transaction on this property
+    transaction = None
+    if viewer_user_type == "buyer":
+        transaction = next((t for t in get_user_buying_transactions(viewer_user_id, "buyer").values()
+                            if t.property_id == property_id), None)
+
+    return _build_property_summary(property_data, documents, transaction)
+
+
+def _build_property_summary(property_data: Property, documents: Dict[str, Document],
+                            transaction: Optional[Buying] = None) -> Dict[str, any]:
+    """Document summary for a property the viewer is known to have access to"""
     summary = {
         "accessible": True,
         "property_title": property_data.title,
@@ -213,39 +234,48 @@ def get_property_document_summary(property_id: str, viewer_user_id: str, viewer_
     }
 
     # Analyze mandatory documents
+    mandatory_legal_docs = property_data.mandatory_legal_docs
+    mandatory_documents = summary["mandatory_documents"]
+    mandatory_uploaded = 0
+    mandatory_validated = 0
+
     for doc_type, doc_name in MANDATORY_DOCS.items():
-        doc_id = property_data.mandatory_legal_docs.get(doc_type)
-        doc_info = {
-            "name": doc_name,
-            "uploaded": False,
-            "validated": False,
-            "document_id": None,
-            "upload_date": None,
-            "validation_date": None
-        }
+        doc_id = mandatory_legal_docs.get(doc_type)
+        document = documents.get(doc_id) if doc_id else None
 
-        if doc_id and doc_id in documents:
-            document = documents[doc_id]
-            doc_info.update({
+        if document is not None:
+            mandatory_documents[doc_type] = {
+                "name": doc_name,
                 "uploaded": True,
                 "validated": document.validation_status,
                 "document_id": doc_id,
                 "upload_date": document.upload_date,
                 "validation_date": document.validation_date
-            })
-            summary["totals"]["mandatory_uploaded"] += 1
+            }
+            mandatory_uploaded += 1
             if document.validation_status:
-                summary["totals"]["mandatory_validated"] += 1
+                mandatory_validated += 1
+        else:
+            mandatory_documents[doc_type] = {
+                "name": doc_name,
+                "uploaded": False,
+                "validated": False,
+                "document_id": None,
+                "upload_date": None,
+                "validation_date": None
+            }
 
-        summary["mandatory_documents"][doc_type] = doc_info
+    summary["totals"]["mandatory_uploaded"] = mandatory_uploaded
+    summary["totals"]["mandatory_validated"] = mandatory_validated
 
     # Analyze additional documents
+    additional_uploaded = 0
     for category, doc_ids in property_data.additional_docs.items():
         if category in ADDITIONAL_DOC_CATEGORIES and doc_ids:
             category_docs = []
             for doc_id in doc_ids:
-                if doc_id in documents:
-                    document = documents[doc_id]
+                document = documents.get(doc_id)
+                if document is not None:
                     category_docs.append({
                         "document_id": doc_id,
                         "name": document.document_name,
@@ -253,60 +283,74 @@ def get_property_document_summary(property_id: str, viewer_user_id: str, viewer_
                         "validated": document.validation_status,
                         "validation_date": document.validation_date
                     })
-                    summary["totals"]["additional_uploaded"] += 1
 
             if category_docs:
+                additional_uploaded += len(category_docs)
                 summary["additional_documents"][category] = {
                     "category_name": ADDITIONAL_DOC_CATEGORIES[category],
                     "documents": category_docs
                 }
 
-    summary["totals"]["additional_total"] = summary["totals"]["additional_uploaded"]
+    summary["totals"]["additional_uploaded"] = additional_uploaded
+    summary["totals"]["additional_total"] = additional_uploaded
+
+    # Analyze transaction documents (buyer view)
+    if transaction is not None:
+        summary["totals"]["transaction_total"] = len(BUYING_DOCUMENT_TYPES)
+        transaction_documents = summary["transaction_documents"]
+        buying_documents = transaction.buying_documents
+        validation_statuses = transaction.document_validation_status
+        transaction_uploaded = 0
+        transaction_validated = 0
+
+        for doc_type, doc_name in BUYING_DOCUMENT_TYPES.items():
+            doc_id = buying_documents.get(doc_type)
+            document = documents.get(doc_id) if doc_id else None
+
+            if document is not None:
+                # Documents not yet reviewed have no validation entry
+                validation_info = validation_statuses.get(doc_type)
+                if validation_info:
+                    is_validated = validation_info.get("validation_status", False)
+                    validation_date = validation_info.get("validation_date")
+                    validation_notes = validation_info.get("validation_notes", "")
+                else:
+                    is_validated, validation_date, validation_notes = False, None, ""
+
+                transaction_documents[doc_type] = {
+                    "name": doc_name,
+                    "uploaded": True,
+                    "validated": is_validated,
+                    "document_id": doc_id,
+                    "upload_date": document.upload_date,
+                    "validation_date": validation_date,
+                    "validation_notes": validation_notes
+                }
+                transaction_uploaded += 1
+                if is_validated:
+                    transaction_validated += 1
+            else:
+                transaction_documents[doc_type] = {
+                    "name": doc_name,
+                    "uploaded": False,
+                    "validated": False,
+                    "document_id": None,
+                    "upload_date": None,
+                    "validation_date": None,
+                    "validation_notes": ""
+                }
 
-    # Analyze transaction documents if buyer
-    if viewer_user_type == "buyer":
-        buying_transactions = get_user_buying_transactions(viewer_user_id, "buyer")
-        for transaction in buying_transactions.values():
-            if transaction.property_id == property_id:
-                summary["totals"]["transaction_total"] = len(BUYING_DOCUMENT_TYPES)
-
-                for doc_type, doc_name in BUYING_DOCUMENT_TYPES.items():
-                    doc_id = transaction.buying_documents.get(doc_type)
-                    doc_info = {
-                        "name": doc_name,
-                        "uploaded": False,
-                        "validated": False,
-                        "document_id": None,
-                        "upload_date": None,
-                        "validation_date": None,
-                        "validation_notes": ""
-                    }
-
-                    if doc_id and doc_id in documents:
-                        document = documents[doc_id]
-                        validation_info = transaction.document_validation_status.get(doc_type, {})
-
-                        doc_info.update({
-                            "uploaded": True,
-                            "validated": validation_info.get("validation_status", False),
-                            "document_id": doc_id,
-                            "upload_date": document.upload_date,
-                            "validation_date": validation_info.get("validation_date"),
-                            "validation_notes": validation_info.get("validation_notes", "")
-                        })
-                        summary["totals"]["transaction_uploaded"] += 1
-                        if validation_info.get("validation_status", False):
-                            summary["totals"]["transaction_validated"] += 1
-
-                    summary["transaction_documents"][doc_type] = doc_info
-                break
+        summary["totals"]["transaction_uploaded"] = transaction_uploaded
+        summary["totals"]["transaction_validated"] = transaction_validated
 
     return summary
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_buyer_document_access_summary(buyer_id: str) -> Dict[str, any]:
     """
     Get a comprehensive summary of all documents accessible to a buyer
+    Cached per buyer; property, document and transaction writes clear it
     """
     buying_transactions = get_user_buying_transactions(buyer_id, "buyer")
 
@@ -337,33 +381,31 @@ def get_buyer_document_access_summary(buyer_id: str) -> Dict[str, any]:
         if not property_data:
             continue
 
-        property_summary = get_property_document_summary(
-            transaction.property_id, buyer_id, "buyer"
-        )
+        # Having the transaction is what grants the buyer access, so no access check is needed
+        property_summary = _build_property_summary(property_data, documents, transaction)
 
-        if property_summary["accessible"]:
-            property_info = {
-                "transaction_id": transaction_id,
-                "property_id": transaction.property_id,
-                "property_title": property_data.title,
-                "transaction_status": transaction.status,
-                "last_updated": transaction.last_updated,
-                "document_summary": property_summary
-            }
+        property_info = {
+            "transaction_id": transaction_id,
+            "property_id": transaction.property_id,
+            "property_title": property_data.title,
+            "transaction_status": transaction.status,
+            "last_updated": transaction.last_updated,
+            "document_summary": property_summary
+        }
 
-            # Add to totals
-            totals = property_summary["totals"]
-            summary["totals"]["total_documents"] += (
-                    totals["mandatory_uploaded"] +
-                    totals["additional_uploaded"] +
-                    totals["transaction_uploaded"]
-            )
-            summary["totals"]["validated_documents"] += (
-                    totals["mandatory_validated"] +
-                    totals["transaction_validated"]
-            )
+        # Add to totals
+        totals = property_summary["totals"]
+        summary["totals"]["total_documents"] += (
+                totals["mandatory_uploaded"] +
+                totals["additional_uploaded"] +
+                totals["transaction_uploaded"]
+        )
+        summary["totals"]["validated_documents"] += (
+                totals["mandatory_validated"] +
+                totals["transaction_validated"]
+        )
 
-            summary["properties"].append(property_info)
+        summary["properties"].append(property_info)
 
     summary["totals"]["pending_documents"] = (
             summary["totals"]["total_documents"] -
@@ -373,32 +415,64 @@ def get_buyer_document_access_summary(buyer_id: str) -> Dict[str, any]:
     return summary
 
 
+def _count_property_documents(user_id: str, user_type: str, property_id: str,
+                              properties: Dict[str, Property]) -> Tuple[int, int, int, int]:
+    """
+    Count the documents get_accessible_documents_for_user would list for one property,
+    without building the lists. The caller must have checked access already.
+
+    Returns:
+        Tuple[int, int, int, int]: (mandatory, additional, transaction, validated)
+    """
+    property_data = properties.get(property_id)
+    if not property_data:
+        return 0, 0, 0, 0
+
+    documents = get_documents()
+    validated_count = 0
+
+    def count(doc_ids) -> int:
+        nonlocal validated_count
+        # Order doesn't matter for counting, so one set intersection finds the stored documents
+        found_ids = documents.keys() & set(doc_ids)
+        validated_count += sum(1 for doc_id in found_ids if documents[doc_id].validation_status)
+        return len(found_ids)
+
+    mandatory_count = count(property_data.mandatory_legal_docs.values())
+    additional_count = count(itertools.chain.from_iterable(property_data.additional_docs.values()))
+
+    transaction_count = 0
+    if user_type == "buyer":
+        transaction = next((t for t in get_user_buying_transactions(user_id, "buyer").values()
+                            if t.property_id == property_id), None)
+        if transaction is not None:
+            transaction_count = count(transaction.buying_documents.values())
+
+    return mandatory_count, additional_count, transaction_count, validated_count
+
+
+@st.cache_data(ttl=30, show_spinner=False)
 def format_document_access_status(user_id: str, user_type: str, property_id: str) -> str:
     """
     Get a formatted string describing document access status for display
+    Cached per (user, property); property, document and transaction writes clear it
     """
-    can_access, reason = can_user_access_property_documents(user_id, user_type, property_id)
+    properties = get_properties()
+    can_access, reason = can_user_access_property_documents(user_id, user_type, property_id, properties)
 
     if not can_access:
         return f"❌ No Access: {reason}"
 
-    # Get document summary
-    accessible_docs = get_accessible_documents_for_user(user_id, user_type, property_id)
-
-    mandatory_count = len(accessible_docs['mandatory_docs'])
-    additional_count = len(accessible_docs['additional_docs'])
-    transaction_count = len(accessible_docs['transaction_docs'])
+    # Count the documents; access was checked above
+    mandatory_count, additional_count, transaction_count, validated_count = _count_property_documents(
+        user_id, user_type, property_id, properties
+    )
 
     total_docs = mandatory_count + additional_count + transaction_count
 
     if total_docs == 0:
         return "⚠️ Access Granted - No Documents Available"
 
-    # Count validated documents
-    validated_count = sum(1 for doc in accessible_docs['mandatory_docs'] if doc.validation_status)
-    validated_count += sum(1 for doc in accessible_docs['additional_docs'] if doc.validation_status)
-    validated_count += sum(1 for doc in accessible_docs['transaction_docs'] if doc.validation_status)
-
     if validated_count == total_docs:
         return f"✅ Full Access - {total_docs} Documents (All Validated)"
     elif validated_count > 0:
@@ -408,98 +482,92 @@ def format_document_access_status(user_id: str, user_type: str, property_id: str
 
 
 # Utility functions for UI components
-def get_document_type_icon(doc_type: str, category: str = None) -> str:
-    """Get appropriate icon for document type"""
-
-    # Mandatory document icons
-    mandatory_icons = {
-        "title_deed": "📜",
-        "land_registry_extract": "🏛️",
-        "building_permit": "🏗️",
-        "habitation_certificate": "🏠",
-        "mortgage_lien_certificate": "💰",
-        "seller_id_document": "🆔",
-        "marital_status_documents": "💑",
-        "power_of_attorney": "⚖️",
-        "litigation_certificate": "📋"
-    }
-
-    # Transaction document icons
-    transaction_icons = {
-        "purchase_contract": "📋",
-        "payment_proof": "💳",
-        "loan_approval": "🏦",
-        "inspection_report": "🔍",
-        "insurance_policy": "🛡️",
-        "transfer_deed": "📜"
-    }
-
-    # Additional document category icons
-    additional_icons = {
-        "supplementary_documents": "📋",
-        "corrections": "✏️",
-        "clarifications": "💡",
-        "agent_notes": "📝",
-        "updated_photos": "📸",
-        "floor_plans": "🗺️",
-        "certificates": "🏆",
-        "correspondence": "📧",
-        "other": "📎"
-    }
 
-    if doc_type in mandatory_icons:
-        return mandatory_icons[doc_type]
-    elif doc_type in transaction_icons:
-        return transaction_icons[doc_type]
-    elif category and category in additional_icons:
-        return additional_icons[category]
-    else:
-        return "📄"
+# Mandatory document icons
+_MANDATORY_ICONS = {
+    "title_deed": "📜",
+    "land_registry_extract": "🏛️",
+    "building_permit": "🏗️",
+    "habitation_certificate": "🏠",
+    "mortgage_lien_certificate": "💰",
+    "seller_id_document": "🆔",
+    "marital_status_documents": "💑",
+    "power_of_attorney": "⚖️",
+    "litigation_certificate": "📋"
+}
+
+# Transaction document icons
+_TRANSACTION_ICONS = {
+    "purchase_contract": "📋",
+    "payment_proof": "💳",
+    "loan_approval": "🏦",
+    "inspection_report": "🔍",
+    "insurance_policy": "🛡️",
+    "transfer_deed": "📜"
+}
+
+# Additional document category icons
+_ADDITIONAL_ICONS = {
+    "supplementary_documents": "📋",
+    "corrections": "✏️",
+    "clarifications": "💡",
+    "agent_notes": "📝",
+    "updated_photos": "📸",
+    "floor_plans": "🗺️",
+    "certificates": "🏆",
+    "correspondence": "📧",
+    "other": "📎"
+}
+
+# Document type icons in one lookup (mandatory types win over transaction types)
+_DOC_TYPE_ICONS = {**_TRANSACTION_ICONS, **_MANDATORY_ICONS}
 
 
-def get_validation_status_display(document: Document, validation_info: Dict = None) -> Dict[str, str]:
-    """Get validation status display information"""
+def get_document_type_icon(doc_type: str, category: str = None) -> str:
+    """Get appropriate icon for document type"""
+    icon = _DOC_TYPE_ICONS.get(doc_type)
+    if icon is None and category:
+        icon = _ADDITIONAL_ICONS.get(category)
+    return icon or "📄"
+
+
+# Shared read-only statuses for the cases with nothing document-specific to show
+_PENDING_STATUS = MappingProxyType({
+    "icon": "⏳",
+    "text": "Pending Validation",
+    "color": "warning",
+    "details": "Awaiting notary validation"
+})
+_VALIDATED_STATUS = MappingProxyType({
+    "icon": "✅",
+    "text": "Validated",
+    "color": "success",
+    "details": "Validated"
+})
+
+
+def get_validation_status_display(document: Document, validation_info: Dict = None) -> Mapping[str, str]:
+    """Get validation status display information (read-only; copy it before changing)"""
 
     if validation_info:
         # For transaction documents with detailed validation info
         is_validated = validation_info.get("validation_status", False)
         validation_notes = validation_info.get("validation_notes", "")
         validation_date = validation_info.get("validation_date")
-
-        if is_validated:
-            status = {
-                "icon": "✅",
-                "text": "Validated",
-                "color": "success",
-                "details": f"Validated on {validation_date.strftime('%Y-%m-%d %H:%M')}" if validation_date else "Validated"
-            }
-            if validation_notes:
-                status["details"] += f" - {validation_notes}"
-        else:
-            status = {
-                "icon": "⏳",
-                "text": "Pending Validation",
-                "color": "warning",
-                "details": "Awaiting notary validation"
-            }
-            if validation_notes:
-                status["details"] += f" - {validation_notes}"
     else:
         # For regular documents
-        if document.validation_status:
-            status = {
-                "icon": "✅",
-                "text": "Validated",
-                "color": "success",
-                "details": f"Validated on {document.validation_date.strftime('%Y-%m-%d %H:%M')}" if document.validation_date else "Validated"
-            }
-        else:
-            status = {
-                "icon": "⏳",
-                "text": "Pending Validation",
-                "color": "warning",
-                "details": "Awaiting notary validation"
-            }
+        is_validated = document.validation_status
+        validation_notes = ""
+        validation_date = document.validation_date
+
+    if not validation_notes and not (is_validated and validation_date):
+        return _VALIDATED_STATUS if is_validated else _PENDING_STATUS
+
+    status = dict(_VALIDATED_STATUS if is_validated else _PENDING_STATUS)
+    if is_validated and validation_date:
+        status["details"] = f"Validated on {validation_date.strftime('%Y-%m-%d %H:%M')}"
+    if validation_notes:
+        status["details"] += f" - {validation_notes}"
 
     return status
 
@@ -3,14 +3,18 @@ File storage utilities for GPP Platform
 Handles actual file uploads and storage
 """
 
+import functools
 import os
 import uuid
+from stat import S_ISREG
 import streamlit as st
 from datetime import datetime
 from typing import Optional, List
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from gpp.interface.config.constants import DATA_DIR
+from gpp.interface.config.constants import DATA_DIR, STATIC_DOCS_DIR, STATIC_DOCS_URL
 
 # File storage directories
 STORAGE_DIR = os.path.join(DATA_DIR, "files")
@@ -18,16 +22,88 @@ DOCUMENTS_STORAGE = os.path.join(STORAGE_DIR, "documents")
 PHOTOS_STORAGE = os.path.join(STORAGE_DIR, "photos")
 ADDITIONAL_DOCS_STORAGE = os.path.join(STORAGE_DIR, "additional_docs")
 
+# Storage type -> directory (unknown types go to DOCUMENTS_STORAGE)
+_STORAGE_DIRS = {
+    "documents": DOCUMENTS_STORAGE,
+    "photos": PHOTOS_STORAGE,
+    "additional_docs": ADDITIONAL_DOCS_STORAGE
+}
+
+# Uploads are streamed to disk in chunks of this size
+_COPY_CHUNK_SIZE = 1024 * 1024
+# Upper bound on concurrent writes in save_multiple_files
+_MAX_UPLOAD_WORKERS = 8
+# Files up to this size are kept in memory by read_file_content across reruns,
+# so the cache holds at most _MAX_CACHED_READS * _MAX_CACHED_READ_SIZE bytes
+_MAX_CACHED_READ_SIZE = 1024 * 1024
+_MAX_CACHED_READS = 32
+
+_file_storage_initialized = False
+
 
 def init_file_storage():
-    """Initialize file storage directories"""
+    """Initialize file storage directories (once per process)"""
+    global _file_storage_initialized
+    if _file_storage_initialized:
+        return
+
     directories = [STORAGE_DIR, DOCUMENTS_STORAGE, PHOTOS_STORAGE, ADDITIONAL_DOCS_STORAGE]
 
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
 
+    _file_storage_initialized = True
 
-def save_uploaded_file(uploaded_file, storage_type="documents", custom_filename=None) -> Optional[str]:
+
+def _write_uploaded_file(uploaded_file, storage_type="documents", custom_filename=None) -> str:
+    """Write an uploaded file into its storage directory and return the path (no UI output, raises on failure)"""
+    # Determine storage directory
+    storage_dir = _STORAGE_DIRS.get(storage_type, DOCUMENTS_STORAGE)
+
+    # Generate unique filename
+    if custom_filename:
+        filename = custom_filename
+    else:
+        # Use original filename with timestamp and a random suffix, so files
+        # uploaded in the same second (e.g. one batch) never overwrite each other
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name, file_extension = os.path.splitext(uploaded_file.name)
+        filename = f"{base_name}_{timestamp}_{uuid.uuid4().hex[:8]}.{file_extension[1:] or 'txt'}"
+
+    # Full file path
+    file_path = os.path.join(storage_dir, filename)
+
+    # Stream the upload to a temporary file instead of materializing it in one
+    # buffer, then swap it into place so a crash never leaves a partial file
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    uploaded_file.seek(0)
+    try:
+        with open(tmp_path, "wb") as f:
+            # Reserve the blocks up front when the size is known (Linux only, best effort)
+            size = getattr(uploaded_file, "size", None)
+            if size and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, size)
+                except OSError:
+                    pass
+            shutil.copyfileobj(uploaded_file, f, _COPY_CHUNK_SIZE)
+            # Drop any preallocated tail if fewer bytes were written than reported
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return file_path
+
+
+def save_uploaded_file(uploaded_file, storage_type="documents", custom_filename=None,
+                       silent: bool = False) -> Optional[str]:
     """
     Save uploaded file to storage and return the file path
 
@@ -35,6 +111,7 @@ def save_uploaded_file(uploaded_file, storage_type="documents", custom_filename=
         uploaded_file: Streamlit uploaded file object
         storage_type: "documents", "photos", or "additional_docs"
         custom_filename: Optional custom filename
+        silent: Skip the success message (for callers that report a whole batch)
 
     Returns:
         str: File path if successful, None if failed
@@ -43,34 +120,10 @@ def save_uploaded_file(uploaded_file, storage_type="documents", custom_filename=
         # Initialize storage if needed
         init_file_storage()
 
-        # Determine storage directory
-        if storage_type == "documents":
-            storage_dir = DOCUMENTS_STORAGE
-        elif storage_type == "photos":
-            storage_dir = PHOTOS_STORAGE
-        elif storage_type == "additional_docs":
-            storage_dir = ADDITIONAL_DOCS_STORAGE
-        else:
-            storage_dir = DOCUMENTS_STORAGE
-
-        # Generate unique filename
-        if custom_filename:
-            filename = custom_filename
-        else:
-            # Use original filename with timestamp to avoid conflicts
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_extension = uploaded_file.name.split('.')[-1] if '.' in uploaded_file.name else 'txt'
-            base_name = uploaded_file.name.rsplit('.', 1)[0] if '.' in uploaded_file.name else uploaded_file.name
-            filename = f"{base_name}_{timestamp}.{file_extension}"
-
-        # Full file path
-        file_path = os.path.join(storage_dir, filename)
-
-        # Save the file
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-
-        st.success(f"✅ File saved: {filename}")
+        file_path = _write_uploaded_file(uploaded_file, storage_type, custom_filename)
+
+        if not silent:
+            st.success(f"✅ File saved: {os.path.basename(file_path)}")
         return file_path
 
     except Exception as e:
@@ -78,23 +131,46 @@ def save_uploaded_file(uploaded_file, storage_type="documents", custom_filename=
         return None
 
 
-def save_multiple_files(uploaded_files: List, storage_type="documents") -> List[str]:
+def save_multiple_files(uploaded_files: List, storage_type="documents", silent: bool = False) -> List[str]:
     """
     Save multiple uploaded files
 
+    The files are written concurrently; Streamlit messages are only emitted from
+    the calling thread, once the whole batch is done.
+
     Args:
         uploaded_files: List of Streamlit uploaded file objects
         storage_type: Storage directory type
+        silent: Skip the aggregated success message
 
     Returns:
         List[str]: List of file paths
     """
-    file_paths = []
+    if not uploaded_files:
+        return []
 
-    for uploaded_file in uploaded_files:
-        file_path = save_uploaded_file(uploaded_file, storage_type)
-        if file_path:
-            file_paths.append(file_path)
+    try:
+        init_file_storage()
+    except Exception as e:
+        st.error(f"❌ Error saving files: {str(e)}")
+        return []
+
+    def write(uploaded_file):
+        try:
+            return _write_uploaded_file(uploaded_file, storage_type), None
+        except Exception as e:
+            return None, f"{uploaded_file.name}: {e}"
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_UPLOAD_WORKERS, len(uploaded_files))) as executor:
+        results = list(executor.map(write, uploaded_files))
+
+    file_paths = [file_path for file_path, _ in results if file_path]
+    errors = [error for _, error in results if error]
+
+    if file_paths and not silent:
+        st.success(f"✅ {len(file_paths)} file(s) saved")
+    for error in errors:
+        st.error(f"❌ Error saving file {error}")
 
     return file_paths
 
@@ -107,34 +183,59 @@ def file_exists(file_path: str) -> bool:
 def get_file_size(file_path: str) -> int:
     """Get file size in bytes"""
     try:
-        return os.path.getsize(file_path) if file_exists(file_path) else 0
-    except:
+        stat = os.stat(file_path)
+    except (OSError, ValueError):
         return 0
+    return stat.st_size if S_ISREG(stat.st_mode) else 0
 
 
 def get_file_info(file_path: str) -> dict:
-    """Get comprehensive file information"""
+    """Get comprehensive file information (a single os.stat, so it always reflects the file on disk)"""
     try:
-        if not file_exists(file_path):
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return {"exists": False}
+        if not S_ISREG(stat.st_mode):
             return {"exists": False}
 
-        stat = os.stat(file_path)
         return {
             "exists": True,
             "size": stat.st_size,
             "size_mb": round(stat.st_size / (1024 * 1024), 2),
             "created": datetime.fromtimestamp(stat.st_ctime),
             "modified": datetime.fromtimestamp(stat.st_mtime),
-            "extension": file_path.split('.')[-1].lower() if '.' in file_path else None
+            "extension": os.path.splitext(file_path)[1][1:].lower() or None
         }
     except Exception as e:
         return {"exists": False, "error": str(e)}
 
 
+def _static_path(file_path: str, document_id: str) -> str:
+    """Path of the published copy of a stored file (see publish_static_file)"""
+    extension = os.path.splitext(file_path)[1].lower()
+    return os.path.join(STATIC_DOCS_DIR, f"{document_id}{extension}")
+
+
+def _remove_static_file(static_path: str):
+    """Remove a published copy, ignoring one that was never published"""
+    try:
+        os.remove(static_path)
+    except FileNotFoundError:
+        pass
+
+
 def delete_file(file_path: str) -> bool:
-    """Delete file from storage"""
+    """Delete file from storage, along with any published copy of it"""
     try:
         if file_exists(file_path):
+            from gpp.interface.utils.database import get_documents
+
+            # Published copies are hard links (or copies), so they outlive the stored file
+            for doc in get_documents().values():
+                if doc.document_path == file_path:
+                    _remove_static_file(_static_path(file_path, doc.document_id))
+
             os.remove(file_path)
             return True
         return False
@@ -143,23 +244,81 @@ def delete_file(file_path: str) -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=_MAX_CACHED_READS)
+def _read_small_file(file_path: str, mtime_ns: int, size: int) -> bytes:
+    """Read a small file, cached per (path, mtime, size) so a rewrite invalidates the entry"""
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
 def read_file_content(file_path: str) -> Optional[bytes]:
     """Read file content as bytes"""
     try:
-        if file_exists(file_path):
-            with open(file_path, "rb") as f:
-                return f.read()
-        return None
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        if not S_ISREG(stat.st_mode):
+            return None
+
+        if stat.st_size <= _MAX_CACHED_READ_SIZE:
+            return _read_small_file(file_path, stat.st_mtime_ns, stat.st_size)
+
+        with open(file_path, "rb") as f:
+            return f.read()
     except Exception as e:
         st.error(f"Error reading file: {str(e)}")
         return None
 
 
+def publish_static_file(file_path: str, document_id: str) -> Optional[str]:
+    """
+    Expose a stored file through Streamlit's static file server
+
+    The file is hard-linked (or copied) once into the static docs folder, so the
+    browser can fetch and cache it by URL instead of receiving it inline on every rerun.
+
+    Args:
+        file_path: Path of the stored file
+        document_id: Document ID used as the public file name
+
+    Returns:
+        str: Relative URL of the published file, None if the file is missing
+    """
+    try:
+        if not file_exists(file_path):
+            return None
+
+        static_path = _static_path(file_path, document_id)
+        static_name = os.path.basename(static_path)
+
+        if not os.path.exists(static_path):
+            os.makedirs(STATIC_DOCS_DIR, exist_ok=True)
+            try:
+                os.link(file_path, static_path)
+            except OSError:
+                shutil.copy2(file_path, static_path)
+
+        return f"{STATIC_DOCS_URL}/{static_name}"
+    except Exception as e:
+        st.error(f"Error publishing file: {str(e)}")
+        return None
+
+
+def read_text_content(file_path: str, max_bytes: Optional[int] = None) -> str:
+    """Read a text file (or its first max_bytes) in a single unbuffered read and decode it as UTF-8"""
+    size = os.path.getsize(file_path)
+    if max_bytes is not None:
+        size = min(size, max_bytes)
+    buffer = bytearray(size)
+    with open(file_path, "rb", buffering=0) as f:
+        read = f.readinto(memoryview(buffer))
+    return buffer[:read].decode("utf-8", errors="replace")
+
+
 def get_storage_stats() -> dict:
     """Get storage statistics"""
     try:
-        init_file_storage()
-
         stats = {
             "documents": {"count": 0, "size": 0},
             "photos": {"count": 0, "size": 0},
@@ -168,20 +327,16 @@ def get_storage_stats() -> dict:
         }
 
         # Count files in each directory
-        for storage_type, directory in [
-            ("documents", DOCUMENTS_STORAGE),
-            ("photos", PHOTOS_STORAGE),
-            ("additional_docs", ADDITIONAL_DOCS_STORAGE)
-        ]:
+        for storage_type, directory in _STORAGE_DIRS.items():
             if os.path.exists(directory):
-                for filename in os.listdir(directory):
-                    file_path = os.path.join(directory, filename)
-                    if os.path.isfile(file_path):
-                        file_size = os.path.getsize(file_path)
-                        stats[storage_type]["count"] += 1
-                        stats[storage_type]["size"] += file_size
-                        stats["total"]["count"] += 1
-                        stats["total"]["size"] += file_size
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            file_size = entry.stat(follow_symlinks=False).st_size
+                            stats[storage_type]["count"] += 1
+                            stats[storage_type]["size"] += file_size
+                            stats["total"]["count"] += 1
+                            stats["total"]["size"] += file_size
 
         # Convert sizes to MB
         for category in stats:
@@ -194,27 +349,45 @@ def get_storage_stats() -> dict:
 
 
 def cleanup_orphaned_files():
-    """Clean up files that are no longer referenced in database"""
+    """
+    Find stored files that are no longer referenced in database
+
+    Published copies whose document is gone (or no longer points at an existing
+    file) are removed outright, since publish_static_file recreates them on demand.
+
+    Returns:
+        List[str]: Paths of the orphaned stored files
+    """
     try:
         from gpp.interface.utils.database import get_documents
 
         # Get all document records
         documents = get_documents()
-        referenced_files = set()
 
-        # Collect all referenced file paths
-        for doc in documents.values():
-            if doc.document_path and file_exists(doc.document_path):
-                referenced_files.add(doc.document_path)
+        # Collect all referenced file paths (missing files simply never match below)
+        referenced_files = {doc.document_path for doc in documents.values() if doc.document_path}
 
         # Check each storage directory
         orphaned_files = []
-        for directory in [DOCUMENTS_STORAGE, PHOTOS_STORAGE, ADDITIONAL_DOCS_STORAGE]:
+        for directory in _STORAGE_DIRS.values():
             if os.path.exists(directory):
-                for filename in os.listdir(directory):
-                    file_path = os.path.join(directory, filename)
-                    if os.path.isfile(file_path) and file_path not in referenced_files:
-                        orphaned_files.append(file_path)
+                with os.scandir(directory) as entries:
+                    orphaned_files.extend(
+                        entry.path for entry in entries
+                        if entry.is_file(follow_symlinks=False) and entry.path not in referenced_files
+                    )
+
+        # Published copies that still back a live document
+        published_files = {
+            _static_path(doc.document_path, doc.document_id)
+            for doc in documents.values()
+            if doc.document_path and file_exists(doc.document_path)
+        }
+        if os.path.exists(STATIC_DOCS_DIR):
+            with os.scandir(STATIC_DOCS_DIR) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and entry.path not in published_files:
+                        _remove_static_file(entry.path)
 
         return orphaned_files
 
@@ -285,14 +458,7 @@ def create_sample_files():
 
     for filename, storage_type, content in sample_files:
         try:
-            if storage_type == "documents":
-                storage_dir = DOCUMENTS_STORAGE
-            elif storage_type == "photos":
-                storage_dir = PHOTOS_STORAGE
-            else:
-                storage_dir = ADDITIONAL_DOCS_STORAGE
-
-            file_path = os.path.join(storage_dir, filename)
+            file_path = os.path.join(_STORAGE_DIRS[storage_type], filename)
 
             if not os.path.exists(file_path):
                 with open(file_path, "w", encoding="utf-8") as f:
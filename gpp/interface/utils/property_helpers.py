@@ -2,28 +2,23 @@
 Property helper functions and utilities
 """
 
+import streamlit as st
 from typing import Dict, Any, List
 from gpp.classes.property import Property, get_property_additional_docs_count, get_property_recent_activity
 from gpp.classes.document import Document
-from gpp.interface.utils.database import get_properties, get_documents
+from gpp.interface.utils.database import get_properties, get_documents, get_property_ids_by_agent
 
 
-def get_property_validation_progress(property_id: str) -> Dict[str, Any]:
-    """Get validation progress for a property"""
-    properties = get_properties()
-    documents = get_documents()
-
-    if property_id not in properties:
-        return {"validated": 0, "total": 0, "progress": 0.0}
-
-    prop_data = properties[property_id]
-    doc_ids = prop_data.mandatory_legal_docs
-
-    total_docs = len([doc_id for doc_id in doc_ids.values() if doc_id])
-    validated_docs = 0
+def _validation_progress(prop_data: Property, documents: Dict[str, Document]) -> Dict[str, Any]:
+    """Compute validation progress of a property against an already loaded documents dict"""
+    total_docs = validated_docs = 0
 
-    for doc_id in doc_ids.values():
-        if doc_id and doc_id in documents and documents[doc_id].validation_status:
+    for doc_id in prop_data.mandatory_legal_docs.values():
+        if not doc_id:
+            continue
+        total_docs += 1
+        document = documents.get(doc_id)
+        if document is not None and document.validation_status:
             validated_docs += 1
 
     progress = validated_docs / total_docs if total_docs > 0 else 0
@@ -35,12 +30,24 @@ def get_property_validation_progress(property_id: str) -> Dict[str, Any]:
     }
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def get_property_validation_progress(property_id: str) -> Dict[str, Any]:
+    """Get validation progress for a property"""
+    properties = get_properties()
+
+    if property_id not in properties:
+        return {"validated": 0, "total": 0, "progress": 0.0}
+
+    return _validation_progress(properties[property_id], get_documents())
+
+
 def get_agent_properties(agent_id: str) -> Dict[str, Property]:
     """Get all properties for a specific agent"""
     properties = get_properties()
-    return {k: v for k, v in properties.items() if v.agent_id == agent_id}
+    return {k: properties[k] for k in get_property_ids_by_agent(agent_id) if k in properties}
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_pending_validation_properties() -> Dict[str, Property]:
     """Get properties pending validation"""
     properties = get_properties()
@@ -48,14 +55,16 @@ def get_pending_validation_properties() -> Dict[str, Property]:
             if v.looking_for_notary and not v.notary_attached}
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_validated_properties() -> Dict[str, Property]:
     """Get fully validated properties available to buyers"""
     properties = get_properties()
+    documents = get_documents()
     validated_properties = {}
 
     for prop_id, prop_data in properties.items():
         # Check if all mandatory documents are validated
-        progress = get_property_validation_progress(prop_id)
+        progress = _validation_progress(prop_data, documents)
         if progress['validated'] == progress['total'] and progress['total'] > 0:
             # Also check if notary is attached (property was approved)
             if prop_data.notary_attached:
@@ -67,14 +76,28 @@ def get_validated_properties() -> Dict[str, Property]:
 def get_property_photos(property_obj: Property) -> List[Document]:
     """Get all photo documents for a property"""
     documents = get_documents()
-    return [doc for doc_id, doc in documents.items()
-            if doc_id in property_obj.document_ids
+    return [doc for doc_id in dict.fromkeys(property_obj.document_ids)
+            if (doc := documents.get(doc_id)) is not None
             and doc.document_name.startswith("Property Photo")]
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def get_property_photos_index() -> Dict[str, List[Document]]:
+    """Get photo documents for every property in one pass, keyed by property ID"""
+    documents = get_documents()
+    photos = {doc_id: doc for doc_id, doc in documents.items()
+              if doc.document_name.startswith("Property Photo")}
+
+    photos_index = {}
+    for prop_id, prop_data in get_properties().items():
+        photos_index[prop_id] = [photos[doc_id] for doc_id in dict.fromkeys(prop_data.document_ids)
+                                 if doc_id in photos]
+    return photos_index
+
+
 def format_timestamp(timestamp) -> str:
-    """Format timestamp for display"""
-    if isinstance(timestamp, str):
-        return timestamp[:16]
-    else:
-        return timestamp.strftime('%Y-%m-%d %H:%M')
\ No newline at end of file
+    """Format timestamp for display (datetimes are the common case, ISO strings are cut to minutes)"""
+    try:
+        return timestamp.strftime('%Y-%m-%d %H:%M')
+    except AttributeError:
+        return timestamp[:16] if timestamp else ''
\ No newline at end of file
@@ -4,6 +4,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import hashlib
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 
 class ChunkedProjectAnalyzer:
@@ -12,20 +15,46 @@ class ChunkedProjectAnalyzer:
     and creating focused summaries for LLM consumption.
     """
 
+    # Content keywords scored in the head of each file
+    BUYING_KEYWORDS = frozenset({
+        'buy', 'buying', 'purchase', 'offer', 'price', 'bid', 'auction',
+        'payment', 'transaction', 'deal', 'contract', 'agreement'
+    })
+    TIME_KEYWORDS = frozenset({
+        'time', 'schedule', 'deadline', 'expir', 'duration', 'timeout',
+        'timer', 'countdown', 'week', 'day', 'hour', 'minute'
+    })
+    VALIDATION_KEYWORDS = frozenset({
+        'notary', 'agent', 'buyer', 'validate', 'validation', 'verify',
+        'approve', 'confirm', 'document', 'signature', 'legal'
+    })
+
+    # (keyword, weight) pairs scored against the file path
+    PATH_KEYWORDS = (
+        ('buy', 100), ('purchase', 100), ('offer', 90), ('price', 80),
+        ('notary', 90), ('agent', 85), ('buyer', 85),
+        ('validation', 70), ('validate', 70), ('verify', 65),
+        ('time', 60), ('schedule', 60), ('deadline', 70),
+        ('document', 50), ('contract', 60), ('agreement', 55)
+    )
+
+    # Files larger than this are only read up to this many characters
+    MAX_FILE_BYTES = 512 * 1024
+
+    # Path keywords that put a file into each themed chunk
+    BUCKET_KEYWORDS = {
+        'buying': ('buy', 'purchase', 'offer', 'price'),
+        'validation': ('notary', 'validation', 'workflow', 'agent'),
+        'utility': ('util', 'helper', 'config', 'database')
+    }
+
+    # Lines that start (after indentation) a function or class definition
+    _DEFINITION_RE = re.compile(r'^[^\S\n]*(?:def |class |async def )', re.MULTILINE)
+    # Whole lines that define a (non-async) function
+    _FUNCTION_LINE_RE = re.compile(r'^[^\S\n]*def [^\n]*', re.MULTILINE)
+
     def __init__(self, max_chunk_size: int = 15000):  # ~15k chars per chunk
         self.max_chunk_size = max_chunk_size
-        self.buying_keywords = {
-            'buy', 'buying', 'purchase', 'offer', 'price', 'bid', 'auction',
-            'payment', 'transaction', 'deal', 'contract', 'agreement'
-        }
-        self.time_keywords = {
-            'time', 'schedule', 'deadline', 'expir', 'duration', 'timeout',
-            'timer', 'countdown', 'week', 'day', 'hour', 'minute'
-        }
-        self.validation_keywords = {
-            'notary', 'agent', 'buyer', 'validate', 'validation', 'verify',
-            'approve', 'confirm', 'document', 'signature', 'legal'
-        }
 
     def scan_and_prioritize(self, root_path: str) -> Dict[str, any]:
         """Scan project and create prioritized file analysis."""
@@ -64,63 +93,83 @@ class ChunkedProjectAnalyzer:
 
         target_extensions = {'.py', '.json', '.md', '.txt', '.yml', '.yaml'}
 
-        for file_path in root_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix in target_extensions:
-                # Skip excluded directories
-                if any(excluded in file_path.parts for excluded in exclude_dirs):
-                    continue
-
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    relative_path = file_path.relative_to(root_path)
-
-                    file_info = {
-                        'path': str(relative_path),
-                        'content': content,
-                        'size': len(content),
-                        'extension': file_path.suffix,
-                        'relevance_score': self._calculate_relevance(str(relative_path), content)
-                    }
-
+        # Collect candidate paths first, then read them concurrently (the reads are I/O-bound).
+        # Directories are walked depth-first with scandir, pruning excluded ones before descending.
+        file_paths = []
+        stack = [str(root_path)]
+        while stack:
+            subdirs = []
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in exclude_dirs:
+                            subdirs.append(entry.path)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1] in target_extensions:
+                        # The size comes with the directory listing on most platforms
+                        file_paths.append((Path(entry.path), entry.stat().st_size))
+            # Reversed, so subdirectories are visited in listing order
+            stack.extend(reversed(subdirs))
+
+        def read_one(item: Tuple[Path, int]) -> Tuple[Optional[Dict], Optional[str]]:
+            file_path, file_size = item
+            truncated = file_size > self.MAX_FILE_BYTES
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read(self.MAX_FILE_BYTES) if truncated else f.read()
+
+                relative_path = str(file_path.relative_to(root_path))
+                path_lower = relative_path.lower()
+                content_lower = content.lower()
+                content_head_lower = content_lower[:2000]  # First 2k chars, used for scoring
+
+                return {
+                    'path': relative_path,
+                    'path_lower': path_lower,
+                    'content': content,
+                    'content_head_lower': content_head_lower,
+                    'size': len(content),
+                    'truncated': truncated,
+                    'extension': file_path.suffix,
+                    'relevance_score': self._calculate_relevance(path_lower, content_head_lower),
+                    # Component markers used by _generate_recommendations
+                    'has_time': 'time' in content_lower,  # also covers 'datetime'
+                    'has_two_week': '2 week' in content_lower or 'fourteen' in content_lower,
+                    'has_workflow': 'workflow' in content_lower,
+                    'notary_count': content_lower.count('notary')
+                }, None
+
+            except Exception as e:
+                return None, f"⚠️  Skipped {file_path}: {e}"
+
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Results come back in path order; skip messages are printed from this thread
+            for file_info, skipped in executor.map(read_one, file_paths):
+                if skipped:
+                    print(skipped)
+                else:
                     files_data.append(file_info)
 
-                except Exception as e:
-                    print(f"⚠️  Skipped {file_path}: {e}")
-
         return files_data
 
-    def _calculate_relevance(self, path: str, content: str) -> int:
-        """Calculate relevance score for buying process."""
+    def _calculate_relevance(self, path_lower: str, content_sample: str) -> int:
+        """Calculate relevance score for buying process (from the lowercased path and content head)."""
 
         score = 0
-        path_lower = path.lower()
-        content_lower = content.lower()
 
         # Path-based scoring
-        path_keywords = {
-            'buy': 100, 'purchase': 100, 'offer': 90, 'price': 80,
-            'notary': 90, 'agent': 85, 'buyer': 85,
-            'validation': 70, 'validate': 70, 'verify': 65,
-            'time': 60, 'schedule': 60, 'deadline': 70,
-            'document': 50, 'contract': 60, 'agreement': 55
-        }
-
-        for keyword, weight in path_keywords.items():
+        for keyword, weight in self.PATH_KEYWORDS:
             if keyword in path_lower:
                 score += weight
 
-        # Content-based scoring (limited to avoid processing huge files)
-        content_sample = content_lower[:2000]  # First 2k chars
-
-        for keyword in self.buying_keywords:
+        # Content-based scoring (limited to the head to avoid processing huge files)
+        for keyword in self.BUYING_KEYWORDS:
             score += content_sample.count(keyword) * 10
 
-        for keyword in self.time_keywords:
+        for keyword in self.TIME_KEYWORDS:
             score += content_sample.count(keyword) * 8
 
-        for keyword in self.validation_keywords:
+        for keyword in self.VALIDATION_KEYWORDS:
             score += content_sample.count(keyword) * 6
 
         # Boost important file types
@@ -142,6 +191,7 @@ class ChunkedProjectAnalyzer:
         high_priority = []
         medium_priority = []
         low_priority = []
+        buckets = {bucket: [] for bucket in self.BUCKET_KEYWORDS}
 
         for file_info in files_data:
             score = file_info['relevance_score']
@@ -152,11 +202,18 @@ class ChunkedProjectAnalyzer:
             else:
                 low_priority.append(file_info)
 
+            # Sort into the themed chunks in the same pass
+            path_lower = file_info['path_lower']
+            for bucket, keywords in self.BUCKET_KEYWORDS.items():
+                if any(keyword in path_lower for keyword in keywords):
+                    buckets[bucket].append(file_info)
+
         return {
             'high': high_priority,
             'medium': medium_priority,
             'low': low_priority,
-            'all': files_data
+            'all': files_data,
+            **buckets
         }
 
     def _create_project_overview(self, prioritized_files: Dict) -> str:
@@ -178,7 +235,7 @@ class ChunkedProjectAnalyzer:
             ext = file_info['extension']
             file_types[ext] = file_types.get(ext, 0) + 1
 
-        overview = f"""# PROJECT OVERVIEW - BUYING PROCESS ANALYSIS
+        parts = [f"""# PROJECT OVERVIEW - BUYING PROCESS ANALYSIS
 
 ## 📊 Statistics
 - Total relevant files: {total_files}
@@ -188,128 +245,119 @@ class ChunkedProjectAnalyzer:
 - File types: {', '.join(f'{ext}({count})' for ext, count in file_types.items())}
 
 ## 🎯 High Priority Files (Top 10)
-"""
+"""]
 
-        for i, file_info in enumerate(prioritized_files['high'][:10]):
-            overview += f"- {file_info['path']} (Score: {file_info['relevance_score']})\n"
+        for file_info in prioritized_files['high'][:10]:
+            parts.append(f"- {file_info['path']} (Score: {file_info['relevance_score']})\n")
 
-        overview += f"""
+        parts.append("""
 ## 🔍 Analysis Focus
 This analysis focuses on:
 1. Time-limited buying offers (2-week expiration)
 2. Multi-party validation (buyer-agent-notary)
 3. Document validation workflows
 4. Price and offer management
-"""
+""")
 
-        return overview
+        return ''.join(parts)
 
     def _create_high_priority_chunk(self, prioritized_files: Dict) -> str:
         """Create chunk with highest priority files."""
 
-        chunk = "# HIGH PRIORITY FILES - CORE BUYING PROCESS\n\n"
-        current_size = len(chunk)
+        parts = ["# HIGH PRIORITY FILES - CORE BUYING PROCESS\n\n"]
+        current_size = len(parts[0])
 
         for file_info in prioritized_files['high']:
-            file_content = f"## File: {file_info['path']}\n"
-            file_content += f"**Relevance Score:** {file_info['relevance_score']}\n"
-            file_content += f"**Size:** {file_info['size']} chars\n\n"
-            file_content += "```python\n" if file_info['extension'] == '.py' else "```\n"
-            file_content += file_info['content']
-            file_content += "\n```\n\n"
+            file_content = ''.join((
+                f"## File: {file_info['path']}\n",
+                f"**Relevance Score:** {file_info['relevance_score']}\n",
+                f"**Size:** {file_info['size']} chars"
+                f"{' (truncated, file is larger)' if file_info['truncated'] else ''}\n\n",
+                "```python\n" if file_info['extension'] == '.py' else "```\n",
+                file_info['content'],
+                "\n```\n\n"
+            ))
 
             if current_size + len(file_content) > self.max_chunk_size:
                 break
 
-            chunk += file_content
+            parts.append(file_content)
             current_size += len(file_content)
 
-        return chunk
+        return ''.join(parts)
 
     def _create_buying_process_chunk(self, prioritized_files: Dict) -> str:
         """Create chunk focused on buying process files."""
 
-        chunk = "# BUYING PROCESS SPECIFIC FILES\n\n"
-        current_size = len(chunk)
-
-        # Filter files related to buying process
-        buying_files = [f for f in prioritized_files['all']
-                        if any(keyword in f['path'].lower()
-                               for keyword in ['buy', 'purchase', 'offer', 'price'])]
-
-        for file_info in buying_files:
-            file_content = f"## {file_info['path']}\n"
+        parts = ["# BUYING PROCESS SPECIFIC FILES\n\n"]
+        current_size = len(parts[0])
 
+        for file_info in prioritized_files['buying']:
             # Extract key functions/classes (for Python files)
             if file_info['extension'] == '.py':
-                key_parts = self._extract_key_parts(file_info['content'])
-                file_content += key_parts
+                body = self._extract_key_parts(file_info['content'])
             else:
-                file_content += f"```\n{file_info['content'][:1000]}...\n```\n"
+                body = f"```\n{file_info['content'][:1000]}...\n```\n"
+            file_content = f"## {file_info['path']}\n{body}"
 
             if current_size + len(file_content) > self.max_chunk_size:
                 break
 
-            chunk += file_content + "\n"
+            parts.append(file_content + "\n")
             current_size += len(file_content)
 
-        return chunk
+        return ''.join(parts)
 
     def _create_validation_chunk(self, prioritized_files: Dict) -> str:
         """Create chunk for validation and workflow files."""
 
-        chunk = "# VALIDATION & WORKFLOW FILES\n\n"
-        current_size = len(chunk)
-
-        validation_files = [f for f in prioritized_files['all']
-                            if any(keyword in f['path'].lower()
-                                   for keyword in ['notary', 'validation', 'workflow', 'agent'])]
+        parts = ["# VALIDATION & WORKFLOW FILES\n\n"]
+        current_size = len(parts[0])
 
-        for file_info in validation_files:
+        for file_info in prioritized_files['validation']:
             if current_size > self.max_chunk_size:
                 break
 
             summary = self._create_file_summary(file_info)
-            chunk += summary + "\n"
+            parts.append(summary + "\n")
             current_size += len(summary)
 
-        return chunk
+        return ''.join(parts)
 
     def _create_utility_chunk(self, prioritized_files: Dict) -> str:
         """Create chunk for utility and configuration files."""
 
-        chunk = "# UTILITY & CONFIGURATION FILES\n\n"
-        current_size = len(chunk)
+        parts = ["# UTILITY & CONFIGURATION FILES\n\n"]
+        current_size = len(parts[0])
 
-        utility_files = [f for f in prioritized_files['all']
-                         if any(keyword in f['path'].lower()
-                                for keyword in ['util', 'helper', 'config', 'database'])]
-
-        for file_info in utility_files:
+        for file_info in prioritized_files['utility']:
             if current_size > self.max_chunk_size:
                 break
 
             summary = self._create_file_summary(file_info)
-            chunk += summary + "\n"
+            parts.append(summary + "\n")
             current_size += len(summary)
 
-        return chunk
+        return ''.join(parts)
 
     def _extract_key_parts(self, content: str) -> str:
         """Extract key functions and classes from Python code."""
 
-        lines = content.split('\n')
         key_parts = []
 
-        for i, line in enumerate(lines):
-            if line.strip().startswith(('def ', 'class ', 'async def ')):
-                # Get function/class definition + a few lines
-                part = []
-                for j in range(i, min(i + 10, len(lines))):
-                    part.append(lines[j])
-                    if j > i and lines[j].strip() and not lines[j].startswith(' '):
-                        break
-                key_parts.append('\n'.join(part))
+        # Jump straight to definition lines and slice the following lines by offset
+        for match in self._DEFINITION_RE.finditer(content):
+            # Get function/class definition + a few lines
+            part = []
+            pos = match.start()
+            for j in range(10):
+                end = content.find('\n', pos)
+                line = content[pos:] if end < 0 else content[pos:end]
+                part.append(line)
+                if end < 0 or (j > 0 and line.strip() and not line.startswith(' ')):
+                    break
+                pos = end + 1
+            key_parts.append('\n'.join(part))
 
         if key_parts:
             return "**Key Components:**\n```python\n" + '\n\n'.join(key_parts) + "\n```\n"
@@ -324,12 +372,12 @@ This analysis focuses on:
         if file_info['extension'] == '.py':
             # Extract docstrings and key info
             content = file_info['content']
-            lines = content.split('\n')
+            lines = content.split('\n', 10)[:10]  # Only the head is searched for a docstring
 
             # Get module docstring
             if '"""' in content or "'''" in content:
                 docstring_start = -1
-                for i, line in enumerate(lines[:10]):
+                for i, line in enumerate(lines):
                     if '"""' in line or "'''" in line:
                         docstring_start = i
                         break
@@ -338,8 +386,8 @@ This analysis focuses on:
                     summary += f"**Purpose:** {lines[docstring_start][:100]}...\n"
 
             # Get key functions
-            functions = [line.strip() for line in lines
-                         if line.strip().startswith('def ')][:3]
+            functions = [match.group().strip()
+                         for match in itertools.islice(self._FUNCTION_LINE_RE.finditer(content), 3)]
             if functions:
                 summary += f"**Key Functions:** {', '.join(f.split('(')[0].replace('def ', '') for f in functions)}\n"
 
@@ -351,34 +399,34 @@ This analysis focuses on:
     def _generate_recommendations(self, prioritized_files: Dict) -> str:
         """Generate recommendations based on the analysis."""
 
-        recommendations = """# RECOMMENDATIONS FOR BUYING PROCESS IMPROVEMENT
+        parts = ["""# RECOMMENDATIONS FOR BUYING PROCESS IMPROVEMENT
 
 ## 🎯 Based on Code Analysis
 
 ### Missing Components Analysis:
-"""
+"""]
 
-        # Check for specific components
-        all_content = ' '.join(f['content'].lower() for f in prioritized_files['all'])
+        # Check for specific components (from the markers recorded while scanning)
+        all_files = prioritized_files['all']
 
         missing_components = []
 
-        if 'datetime' not in all_content and 'time' not in all_content:
+        if not any(f['has_time'] for f in all_files):
             missing_components.append("⏰ Time management system")
 
-        if '2 week' not in all_content and 'fourteen' not in all_content:
+        if not any(f['has_two_week'] for f in all_files):
             missing_components.append("📅 2-week offer expiration logic")
 
-        if 'workflow' not in all_content:
+        if not any(f['has_workflow'] for f in all_files):
             missing_components.append("🔄 Multi-party workflow system")
 
-        if all_content.count('notary') < 5:
+        if sum(f['notary_count'] for f in all_files) < 5:
             missing_components.append("👨‍⚖️ Comprehensive notary validation")
 
         for component in missing_components:
-            recommendations += f"- {component}\n"
+            parts.append(f"- {component}\n")
 
-        recommendations += """
+        parts.append("""
 ### Priority Implementation Order:
 1. **Time Management System** - Add datetime handling for 2-week expiration
 2. **Offer Workflow** - Create buyer→agent→notary approval chain
@@ -391,20 +439,26 @@ This analysis focuses on:
 - `workflows/buying_process.py` - Multi-party workflow orchestration
 - `services/notification.py` - Status change notifications
 - `utils/time_management.py` - Deadline and expiration utilities
-"""
+""")
 
-        return recommendations
+        return ''.join(parts)
 
     def save_analysis_chunks(self, analysis: Dict, output_dir: str = "analysis_chunks"):
         """Save analysis chunks as separate files."""
 
         os.makedirs(output_dir, exist_ok=True)
 
-        for chunk_name, content in analysis.items():
+        def write_chunk(item: Tuple[str, str]) -> str:
+            chunk_name, content = item
             filename = f"{output_dir}/{chunk_name}.md"
             with open(filename, 'w', encoding='utf-8') as f:
                 f.write(content)
-            print(f"💾 Saved: {filename}")
+            return filename
+
+        # Write the chunks concurrently; report them in order once they are on disk
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for filename in executor.map(write_chunk, analysis.items()):
+                print(f"💾 Saved: {filename}")
 
         # Create index file
         index_content = f"""# PROJECT ANALYSIS INDEX
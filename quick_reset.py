@@ -5,6 +5,58 @@ Run this script to quickly reset all properties while keeping users intact
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+EMPTY_JSON = "{}"
+
+# Property references cleared from buyer and notary records
+BUYER_PROPERTY_LISTS = ("interested_properties", "reserved_properties")
+NOTARY_WORK_LISTS = ("checked_prop_list", "properties_to_check", "buyers_to_check")
+
+
+def _load_json(file_path):
+    """Load a JSON file, using orjson when it is installed"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _dump_json(file_path, data):
+    """Write data as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(file_path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def _clear_lists(record, keys):
+    """Empty the given list fields of a record; return True if anything changed"""
+    changed = False
+    for key in keys:
+        if record.get(key) != []:
+            record[key] = []
+            changed = True
+    return changed
+
+
+def _clear_directory(dir_path):
+    """Delete the regular files in dir_path (creating it if missing) and return a status line"""
+    if not os.path.exists(dir_path):
+        os.makedirs(dir_path, exist_ok=True)
+        return f"✅ Created directory: {dir_path}"
+
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                os.unlink(entry.path)
+    return f"✅ Cleaned files in: {dir_path}"
 
 
 def quick_property_reset():
@@ -21,45 +73,57 @@ def quick_property_reset():
         "data/buying_chats.json"
     ]
 
-    # Reset each file to empty JSON
+    # Reset each file to empty JSON (written as a literal, no encoder needed)
     for file_path in files_to_reset:
         if os.path.exists(file_path):
             with open(file_path, 'w') as f:
-                json.dump({}, f, indent=2)
+                f.write(EMPTY_JSON)
             print(f"✅ Reset: {file_path}")
         else:
             print(f"⚠️  Creating: {file_path}")
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             with open(file_path, 'w') as f:
-                json.dump({}, f, indent=2)
+                f.write(EMPTY_JSON)
+
+    # Drop the buying transactions logs so they are not replayed over the empty snapshot
+    for wal_file in ("data/buying_transactions.wal",
+                     "data/buying_transactions.wal.compacting",
+                     "data/buying_transactions.wal.lock"):
+        if os.path.exists(wal_file):
+            os.remove(wal_file)
+            print(f"✅ Removed: {wal_file}")
 
     # Clean buyer interests (remove property references)
     buyers_file = "data/buyers.json"
     if os.path.exists(buyers_file):
-        with open(buyers_file, 'r') as f:
-            buyers = json.load(f)
-
-        for buyer_id, buyer_data in buyers.items():
-            buyer_data["interested_properties"] = []
-            buyer_data["reserved_properties"] = []
+        buyers = _load_json(buyers_file)
 
-        with open(buyers_file, 'w') as f:
-            json.dump(buyers, f, indent=2)
+        # Clear every record first (a generator inside any() would stop at the first change)
+        changed = [_clear_lists(buyer_data, BUYER_PROPERTY_LISTS) for buyer_data in buyers.values()]
+        if any(changed):
+            _dump_json(buyers_file, buyers)
         print(f"✅ Cleaned buyer interests: {buyers_file}")
 
+    buyers_dir = "data/buyers"
+    if os.path.isdir(buyers_dir):
+        with os.scandir(buyers_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
+                buyer_data = _load_json(entry.path)
+
+                if _clear_lists(buyer_data, BUYER_PROPERTY_LISTS):
+                    _dump_json(entry.path, buyer_data)
+        print(f"✅ Cleaned buyer interests: {buyers_dir}/")
+
     # Clean notary work lists (remove property references)
     notaries_file = "data/notaries.json"
     if os.path.exists(notaries_file):
-        with open(notaries_file, 'r') as f:
-            notaries = json.load(f)
+        notaries = _load_json(notaries_file)
 
-        for notary_id, notary_data in notaries.items():
-            notary_data["checked_prop_list"] = []
-            notary_data["properties_to_check"] = []
-            notary_data["buyers_to_check"] = []
-
-        with open(notaries_file, 'w') as f:
-            json.dump(notaries, f, indent=2)
+        changed = [_clear_lists(notary_data, NOTARY_WORK_LISTS) for notary_data in notaries.values()]
+        if any(changed):
+            _dump_json(notaries_file, notaries)
         print(f"✅ Cleaned notary work lists: {notaries_file}")
 
     # Clean uploaded files but keep directories
@@ -67,19 +131,14 @@ def quick_property_reset():
         "data/files/documents",
         "data/files/photos",
         "data/files/additional_docs",
-        "data/files/buying_documents"
+        "data/files/buying_documents",
+        "static/docs"  # Published copies of the documents above
     ]
 
-    for dir_path in file_dirs:
-        if os.path.exists(dir_path):
-            for filename in os.listdir(dir_path):
-                file_path = os.path.join(dir_path, filename)
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-            print(f"✅ Cleaned files in: {dir_path}")
-        else:
-            os.makedirs(dir_path, exist_ok=True)
-            print(f"✅ Created directory: {dir_path}")
+    # Directories are independent, so clean them concurrently and report in order
+    with ThreadPoolExecutor(max_workers=len(file_dirs)) as executor:
+        for message in executor.map(_clear_directory, file_dirs):
+            print(message)
 
     print("\n🎉 QUICK PROPERTY RESET COMPLETE!")
     print("✅ All properties deleted")